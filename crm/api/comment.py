@@ -2,14 +2,43 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 
+import re
 from collections.abc import Iterable
+from html import unescape
+from io import BytesIO
 
 import frappe
 from frappe import _
-from bs4 import BeautifulSoup
-from frappe.utils import now_datetime, strip_html
-
-from crm.fcrm.doctype.crm_notification.crm_notification import notify_user
+from frappe.utils import get_datetime
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree
+
+from crm.api import reminders as rapi
+from crm.fcrm.doctype.crm_notification.crm_notification import notify_users_bulk
+
+# نبني شجرة لـ spans المنشن فقط بدل كامل محتوى التعليق
+_MENTION_STRAINER = SoupStrainer("span", attrs={"data-type": "mention"})
+# فحص سريع: معظم التعليقات بدون منشن فمش محتاجين نعمل parse أصلاً
+_MENTION_HINT_RE = re.compile(r"""data-type\s*=\s*["']?mention""", re.I)
+# شكل الـ span ثابت لأنه طالع من مكوّن المنشن في الواجهة
+_MENTION_TAG_RE = re.compile(r"""<span\b[^>]*\bdata-type\s*=\s*["']mention["'][^>]*>""", re.I)
+_MENTION_ATTR_RE = re.compile(r"""\bdata-(id|label)\s*=\s*(["'])(.*?)\2""", re.I | re.S)
+# فوق الحجم ده الـ fallback بيعمل stream parse بدل ما يبني شجرة كاملة
+_STREAM_PARSE_THRESHOLD = 64 * 1024
+
+_MENTION_NOTIFICATION_TEMPLATE = """
+    <div class="mb-2 leading-5 text-ink-gray-5">
+        <span class="font-medium text-ink-gray-9">{owner}</span>
+        <span>{verb}</span>
+        <span class="font-medium text-ink-gray-9">{name}</span>
+    </div>
+"""
+
+# معاينة last_comment في الـ Lead
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+# المعاينة 140 حرف بس، فمش محتاجين نمسح HTML أطول من كده بكتير
+_PREVIEW_SCAN_LIMIT = 4096
 
 # -----------------------------------
 # Hooks
@@ -18,10 +47,8 @@ from crm.fcrm.doctype.crm_notification.crm_notification import notify_user
 def on_update(self, method=None):
     """
     - إشعار المنشنز في محتوى التعليق.
-    - إدارة وسم التأخير delayed تلقائيًا:
-        * mark_overdue_comment: يعلّم آخر كومنت كمتأخر لو فيه Reminder متأخر.
-        * clear_delayed_flags: ينضّف الوسم لو الكومنت الحالي أحدث من موعد آخر Reminder متأخر
-          أو لو مفيش أصلاً Reminder متأخر.
+    - تحديث last_comment في الـ Lead.
+    - إدارة وسم التأخير delayed تلقائيًا في الخلفية (_reconcile_delayed_flags).
     """
     # إشعارات المنشنز
     notify_mentions(self)
@@ -31,56 +58,59 @@ def on_update(self, method=None):
 
     # منطق delayed مربوط فقط على تعليقات "Comment" المرتبطة بمستند
     try:
-        if getattr(self, "comment_type", None) != "Comment":
+        if self.comment_type != "Comment":
             return
-        if not getattr(self, "reference_doctype", None) or not getattr(self, "reference_name", None):
+        if not self.reference_doctype or not self.reference_name:
             return
 
-        doctype = self.reference_doctype
-        name = self.reference_name
-
-        # استدعاءات الـ Reminder API
-        from crm.api import reminders as rapi  # الاستيراد هنا لتجنب الدورات
-
-        # 1) جرّب تمييز المتأخر لو فيه overdue reminder
-        try:
-            rapi.mark_overdue_comment(doctype, name)
-        except Exception:
-            frappe.log_error(frappe.get_traceback(), "comment.on_update -> mark_overdue_comment")
-
-        # 2) لو الكومنت الحالي أحدث من آخر overdue reminder → امسح أي delayed قديم
-        try:
-            schema = rapi._reminder_schema()
-            reminder_filters = {
-                schema["ref_dt"]: doctype,
-                schema["ref_nm"]: name,
-                "user": frappe.session.user,
-            }
-            if schema["has_status"]:
-                reminder_filters["status"] = ["in", ["Open", "Scheduled"]]
-
-            overdue = frappe.get_all(
-                rapi.REMINDER_DT,
-                filters=reminder_filters | {"remind_at": ("<=", now_datetime())},
-                fields=["name", "remind_at"],
-                order_by="remind_at desc",
-                limit=1,
-            )
-            if overdue:
-                r_at = overdue[0]["remind_at"]
-                if getattr(self, "creation", None) and self.creation >= r_at:
-                    # الكومنت أحدث من موعد آخر تذكير متأخر ⇒ نظّف الوسوم
-                    rapi.clear_delayed_flags(doctype, name)
-            else:
-                # مفيش متأخر خالص ⇒ نظّف أي delayed قديم
-                rapi.clear_delayed_flags(doctype, name)
-        except Exception:
-            frappe.log_error(frappe.get_traceback(), "comment.on_update -> clear_delayed_flags")
-
+        # الـ housekeeping ده مش محتاجه المستخدم، فبيتنفذ في الخلفية بعد الـ commit.
+        # job_id بالكومنت: أكتر من save لنفس الكومنت قبل ما الـ job تشتغل = تشغيلة واحدة
+        frappe.enqueue(
+            "crm.api.comment._reconcile_delayed_flags",
+            queue="short",
+            job_id=f"crm-reconcile-delayed::{self.name}",
+            deduplicate=True,
+            enqueue_after_commit=True,
+            doctype=self.reference_doctype,
+            name=self.reference_name,
+            comment_creation=self.creation,
+        )
     except Exception:
         frappe.log_error(frappe.get_traceback(), "comment.on_update (outer)")
 
 
+def _reconcile_delayed_flags(doctype: str, name: str, comment_creation=None):
+    """
+    Background job من on_update:
+        * mark_overdue_comment: يعلّم آخر كومنت كمتأخر لو فيه Reminder متأخر.
+        * clear_delayed_flags: ينضّف الوسم لو الكومنت أحدث من موعد آخر Reminder متأخر
+          أو لو مفيش أصلاً Reminder متأخر.
+    """
+    # آخر موعد متأخر على المستند وآخر موعد للمستخدم نفسه في query واحدة
+    user = frappe.session.user
+    last_overdue, last_own_overdue = rapi._latest_overdue_at(doctype, name, user)
+
+    # 1) جرّب تمييز المتأخر لو فيه overdue reminder
+    try:
+        rapi._ensure_can_read(doctype, name)
+        overdue = [{"remind_at": last_overdue}] if last_overdue else []
+        rapi._mark_overdue_comment(doctype, name, overdue)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "comment.on_update -> mark_overdue_comment")
+
+    # 2) لو الكومنت أحدث من آخر overdue reminder → امسح أي delayed قديم
+    try:
+        if last_own_overdue:
+            if comment_creation and get_datetime(comment_creation) >= last_own_overdue:
+                # الكومنت أحدث من موعد آخر تذكير متأخر ⇒ نظّف الوسوم
+                rapi.clear_delayed_flags(doctype, name)
+        else:
+            # مفيش متأخر خالص ⇒ نظّف أي delayed قديم
+            rapi.clear_delayed_flags(doctype, name)
+    except Exception:
+        frappe.log_error(frappe.get_traceback(), "comment.on_update -> clear_delayed_flags")
+
+
 # -----------------------------------
 # Mentions
 # -----------------------------------
@@ -89,53 +119,99 @@ def notify_mentions(doc):
     """
     استخراج المنشنز من content (HTML) وإرسال إشعارات لهم.
     """
-    content = getattr(doc, "content", None)
+    content = doc.content
     if not content:
         return
 
-    mentions = extract_mentions(content)
+    # notify_user skips self-mentions anyway; drop them before any lookups.
+    # A user mentioned several times in one comment gets a single notification.
+    seen = {doc.owner}
+    mentions = []
+    for m in extract_mentions(content):
+        if m.email and m.email not in seen:
+            seen.add(m.email)
+            mentions.append(m)
     if not mentions:
         return
 
-    reference_doc = frappe.get_doc(doc.reference_doctype, doc.reference_name)
-    for mention in mentions:
-        owner = frappe.get_cached_value("User", doc.owner, "full_name")
-        doctype = doc.reference_doctype
-        if doctype.startswith("CRM "):
-            doctype = doctype[4:].lower()
-        name = (
-            reference_doc.lead_name
-            if doctype == "lead"
-            else reference_doc.organization or reference_doc.lead_name
-        )
-        notification_text = f"""
-            <div class="mb-2 leading-5 text-ink-gray-5">
-                <span class="font-medium text-ink-gray-9">{ owner }</span>
-                <span>{ _('mentioned you in {0}').format(doctype) }</span>
-                <span class="font-medium text-ink-gray-9">{ name }</span>
-            </div>
-        """
-        notify_user(
-            {
-                "owner": doc.owner,
-                "assigned_to": mention.email,
-                "notification_type": "Mention",
-                "message": doc.content,
-                "notification_text": notification_text,
-                "reference_doctype": "Comment",
-                "reference_docname": doc.name,
-                "redirect_to_doctype": doc.reference_doctype,
-                "redirect_to_docname": doc.reference_name,
-            }
-        )
+    # محتاجين حقلين بس من المستند المرجعي، مش الـ doc كله
+    reference_doc = frappe.db.get_value(
+        doc.reference_doctype, doc.reference_name, ["lead_name", "organization"], as_dict=True
+    ) or frappe._dict()
+    owner = frappe.get_cached_value("User", doc.owner, "full_name")
+    doctype = doc.reference_doctype
+    if doctype.startswith("CRM "):
+        doctype = doctype[4:].lower()
+    name = (
+        reference_doc.lead_name
+        if doctype == "lead"
+        else reference_doc.organization or reference_doc.lead_name
+    )
+    notification_text = _MENTION_NOTIFICATION_TEMPLATE.format(
+        owner=owner, verb=_("mentioned you in {0}").format(doctype), name=name
+    )
+    notify_users_bulk(
+        {
+            "owner": doc.owner,
+            "assigned_to": mention.email,
+            "notification_type": "Mention",
+            "message": doc.content,
+            "notification_text": notification_text,
+            "reference_doctype": "Comment",
+            "reference_docname": doc.name,
+            "redirect_to_doctype": doc.reference_doctype,
+            "redirect_to_docname": doc.reference_name,
+        }
+        for mention in mentions
+    )
 
 
 def extract_mentions(html):
     if not html:
         return []
-    soup = BeautifulSoup(html, "html.parser")
+    if isinstance(html, bytes):
+        html = html.decode("utf-8", "replace")
+    if not _MENTION_HINT_RE.search(html):
+        return []
+    try:
+        mentions = _extract_mentions_re(html)
+    except Exception:
+        mentions = None
+    if not mentions:
+        # markup غير متوقع (مثلاً attributes بدون quotes) → ارجع للـ parser الكامل
+        if len(html) > _STREAM_PARSE_THRESHOLD:
+            mentions = _extract_mentions_stream(html)
+        else:
+            mentions = _extract_mentions_soup(html)
+    return mentions
+
+
+def _extract_mentions_re(html):
+    mentions = []
+    for tag in _MENTION_TAG_RE.finditer(html):
+        attrs = {key.lower(): unescape(value) for key, _q, value in _MENTION_ATTR_RE.findall(tag.group(0))}
+        mentions.append(frappe._dict(full_name=attrs.get("label"), email=attrs.get("id")))
+    return mentions
+
+
+def _extract_mentions_stream(html):
+    """Pull-parse span elements and discard each one, memory stays bounded for huge bodies."""
     mentions = []
-    for d in soup.find_all("span", attrs={"data-type": "mention"}):
+    for _event, elem in etree.iterparse(
+        BytesIO(html.encode("utf-8")), events=("end",), tag="span", html=True, recover=True
+    ):
+        if elem.get("data-type") == "mention":
+            mentions.append(frappe._dict(full_name=elem.get("data-label"), email=elem.get("data-id")))
+        elem.clear()
+    return mentions
+
+
+def _extract_mentions_soup(html):
+    soup = BeautifulSoup(html, "lxml", parse_only=_MENTION_STRAINER)
+    mentions = []
+    for d in soup.children:
+        if d.name != "span":
+            continue
         mentions.append(
             frappe._dict(full_name=d.get("data-label"), email=d.get("data-id"))
         )
@@ -153,11 +229,25 @@ def add_attachments(name: str, attachments: Iterable[str | dict]) -> None:
     :param name: Comment name
     :param attachments: File names or dicts with keys "fname" and "fcontent"
     """
+    attachments = list(attachments)
+
+    # File rows for the name-only attachments in one query instead of one per name
+    file_names = list(dict.fromkeys(a for a in attachments if isinstance(a, str)))
+    existing_files = {}
+    if file_names:
+        existing_files = {
+            f.name: f
+            for f in frappe.get_all(
+                "File",
+                filters={"name": ["in", file_names]},
+                fields=["name", "file_url", "is_private"],
+            )
+        }
+
     for a in attachments:
         if isinstance(a, str):
-            attach = frappe.db.get_value(
-                "File", {"name": a}, ["file_url", "is_private"], as_dict=1
-            )
+            # pop: a name listed twice is only attached once
+            attach = existing_files.pop(a, None)
             if not attach:
                 continue
             file_args = {
@@ -202,14 +292,29 @@ def update_lead_last_comment(doc):
         if not content:
             return
 
-        # Strip HTML tags
-        clean_content = strip_html(content)
+        # Only the first 140 visible chars are kept, so cap the HTML we scan
+        if len(content) > _PREVIEW_SCAN_LIMIT:
+            content = content[:_PREVIEW_SCAN_LIMIT]
+            # drop a tag cut in half by the slice so it isn't left in the text
+            if content.rfind("<") > content.rfind(">"):
+                content = content[: content.rfind("<")]
+
+        # Strip HTML tags and collapse whitespace for a one-line preview
+        clean_content = _WS_RE.sub(" ", _HTML_TAG_RE.sub("", content)).strip()
         
         # Truncate if necessary (Small Text is usually 65535 chars, but good to be safe for display)
         if len(clean_content) > 140:
              clean_content = clean_content[:137] + "..."
 
-        frappe.db.set_value("CRM Lead", doc.reference_name, "last_comment", clean_content)
+        # Re-saves of the same comment produce the same preview, skip the UPDATE
+        current = frappe.db.get_value("CRM Lead", doc.reference_name, "last_comment")
+        if current == clean_content:
+            return
+
+        # Derived display field: don't bump modified/modified_by on the Lead
+        frappe.db.set_value(
+            "CRM Lead", doc.reference_name, "last_comment", clean_content, update_modified=False
+        )
         
     except Exception:
         frappe.log_error(frappe.get_traceback(), "update_lead_last_comment failed")
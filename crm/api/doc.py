@@ -1,18 +1,139 @@
-import json
+import re
+from collections import defaultdict
+from contextlib import contextmanager
 from typing import Optional
 
 import frappe
 from frappe import _
 from frappe.custom.doctype.property_setter.property_setter import make_property_setter
+from frappe.desk.form.assign_to import add as add_assignment
 from frappe.desk.form.assign_to import set_status
 from frappe.model import no_value_fields
 from frappe.model.document import get_controller
-from frappe.utils import make_filter_tuple
-from pypika import Criterion
+from frappe.utils import cint, make_filter_tuple, now_datetime
 
+from crm.api.todo import notify_cancelled_assignments
 from crm.api.views import get_views
 from crm.fcrm.doctype.crm_form_script.crm_form_script import get_form_script
-from crm.utils import get_dynamic_linked_docs, get_linked_docs
+from crm.utils import (
+    get_bulk_dynamic_linked_docs,
+    get_bulk_linked_docs,
+    get_dynamic_linked_docs,
+    get_linked_docs,
+    json_dumps,
+    json_loads,
+)
+
+NO_VALUE_FIELDTYPES = frozenset(no_value_fields)
+LAYOUT_FIELDTYPES = frozenset({"Tab Break", "Section Break", "Column Break"})
+GET_FIELDS_EXCLUDED_FIELDTYPES = NO_VALUE_FIELDTYPES | {"Read Only"}
+FILTERABLE_FIELDTYPES = frozenset(
+    {
+        "Check",
+        "Data",
+        "Float",
+        "Int",
+        "Currency",
+        "Dynamic Link",
+        "Link",
+        "Long Text",
+        "Select",
+        "Small Text",
+        "Text Editor",
+        "Text",
+        "Duration",
+        "Date",
+        "Datetime",
+    }
+)
+GROUP_BY_FIELDTYPES = frozenset(
+    {
+        "Check",
+        "Data",
+        "Float",
+        "Int",
+        "Currency",
+        "Dynamic Link",
+        "Link",
+        "Select",
+        "Duration",
+        "Date",
+        "Datetime",
+    }
+)
+
+# standard (non-DocField) fields offered next to the meta fields; callers mutate the
+# entries they return, so these are copied with dict(...) before use
+SORT_STANDARD_FIELDS = (
+    {"label": "Name", "fieldname": "name"},
+    {"label": "Created On", "fieldname": "creation"},
+    {"label": "Last Modified", "fieldname": "modified"},
+    {"label": "Modified By", "fieldname": "modified_by"},
+    {"label": "Owner", "fieldname": "owner"},
+)
+GROUP_BY_STANDARD_FIELDS = (
+    {"label": "Name", "fieldname": "name"},
+    {"label": "Created On", "fieldname": "creation"},
+    {"label": "Last Modified", "fieldname": "modified"},
+    {"label": "Modified By", "fieldname": "modified_by"},
+    {"label": "Owner", "fieldname": "owner"},
+    {"label": "Liked By", "fieldname": "_liked_by"},
+    {"label": "Assigned To", "fieldname": "_assign"},
+    {"label": "Comments", "fieldname": "_comments"},
+    {"label": "Created On", "fieldname": "creation"},
+    {"label": "Modified On", "fieldname": "modified"},
+)
+# "options" of the ID field is the doctype itself and is filled in per call
+META_STANDARD_FIELDS = (
+    {"fieldname": "name", "fieldtype": "Link", "label": "ID"},
+    {"fieldname": "owner", "fieldtype": "Link", "label": "Created By", "options": "User"},
+    {
+        "fieldname": "modified_by",
+        "fieldtype": "Link",
+        "label": "Last Updated By",
+        "options": "User",
+    },
+    {"fieldname": "_user_tags", "fieldtype": "Data", "label": "Tags"},
+    {"fieldname": "_liked_by", "fieldtype": "Data", "label": "Like"},
+    {"fieldname": "_comments", "fieldtype": "Text", "label": "Comments"},
+    {"fieldname": "_assign", "fieldtype": "Text", "label": "Assigned To"},
+    {"fieldname": "creation", "fieldtype": "Datetime", "label": "Created On"},
+    {"fieldname": "modified", "fieldtype": "Datetime", "label": "Last Updated On"},
+)
+DATA_STANDARD_FIELDS = (
+    {"label": "Name", "fieldtype": "Data", "fieldname": "name"},
+    {"label": "Created On", "fieldtype": "Datetime", "fieldname": "creation"},
+    {"label": "Last Modified", "fieldtype": "Datetime", "fieldname": "modified"},
+    {
+        "label": "Modified By",
+        "fieldtype": "Link",
+        "fieldname": "modified_by",
+        "options": "User",
+    },
+    {"label": "Assigned To", "fieldtype": "Text", "fieldname": "_assign"},
+    {"label": "Owner", "fieldtype": "Link", "fieldname": "owner", "options": "User"},
+    {"label": "Like", "fieldtype": "Data", "fieldname": "_liked_by"},
+)
+
+
+def get_meta_standard_fields(doctype):
+    fields = [dict(field) for field in META_STANDARD_FIELDS]
+    fields[0]["options"] = doctype
+    return fields
+
+
+QUICK_FILTERS_CACHE_KEY = "crm_quick_filters"
+
+OVERDUE_TASKS_CHECK_KEY = "crm_overdue_tasks_checked"
+OVERDUE_TASKS_CHECK_TTL = 60
+
+DELETE_BULK_CHUNK_SIZE = 200
+
+# Error Log "error" is a Code (longtext) field, keep one batch's message well below that
+ASSIGN_ERROR_LOG_MAX_LENGTH = 100_000
+
+# "modified desc", "`tabCRM Lead`.`modified` desc" -> ("modified", "desc")
+_ORDER_BY_PART_RE = re.compile(r"\s*(?:`?tab[^`.]+`?\.)?`?(\w+)`?(?:\s+(asc|desc))?\s*", re.I)
 
 
 @frappe.whitelist()
@@ -20,18 +141,18 @@ def update_lead_status(name: str, status: str):
     if not frappe.has_permission("CRM Lead", "write", name):
         frappe.throw(_("No permission to update lead status"), frappe.PermissionError)
 
+    # the request finalizer commits; no extra COMMIT in the hot path
     frappe.db.set_value("CRM Lead", name, "status", status)
-    frappe.db.commit()
     return {"name": name, "status": status}
 
 
 @frappe.whitelist(allow_guest=True)
 def sort_options(doctype: str):
     fields = frappe.get_meta(doctype).fields
-    fields = [field for field in fields if field.fieldtype not in no_value_fields]
+    fields = [field for field in fields if field.fieldtype not in NO_VALUE_FIELDTYPES]
     fields = [
         {
-            "label": _(field.label),
+            "label": translate_label(field.label),
             "value": field.fieldname,
             "fieldname": field.fieldname,
         }
@@ -39,46 +160,26 @@ def sort_options(doctype: str):
         if field.label and field.fieldname
     ]
 
-    standard_fields = [
-        {"label": "Name", "fieldname": "name"},
-        {"label": "Created On", "fieldname": "creation"},
-        {"label": "Last Modified", "fieldname": "modified"},
-        {"label": "Modified By", "fieldname": "modified_by"},
-        {"label": "Owner", "fieldname": "owner"},
-    ]
-
-    for field in standard_fields:
-        field["label"] = _(field["label"])
-        field["value"] = field["fieldname"]
-        fields.append(field)
+    for field in SORT_STANDARD_FIELDS:
+        fields.append(
+            {
+                "label": translate_label(field["label"]),
+                "fieldname": field["fieldname"],
+                "value": field["fieldname"],
+            }
+        )
 
     return fields
 
 
 @frappe.whitelist(allow_guest=True)
 def get_filterable_fields(doctype: str):
-    allowed_fieldtypes = [
-        "Check",
-        "Data",
-        "Float",
-        "Int",
-        "Currency",
-        "Dynamic Link",
-        "Link",
-        "Long Text",
-        "Select",
-        "Small Text",
-        "Text Editor",
-        "Text",
-        "Duration",
-        "Date",
-        "Datetime",
-    ]
+    allowed_fieldtypes = FILTERABLE_FIELDTYPES
 
     c = get_controller(doctype)
-    restricted_fields = []
+    restricted_fields = frozenset()
     if hasattr(c, "get_non_filterable_fields"):
-        restricted_fields = c.get_non_filterable_fields()
+        restricted_fields = frozenset(c.get_non_filterable_fields())
 
     res = []
 
@@ -93,29 +194,14 @@ def get_filterable_fields(doctype: str):
     res.extend(custom_fields)
 
     # append standard fields (getting error when using frappe.model.std_fields)
-    standard_fields = [
-        {"fieldname": "name", "fieldtype": "Link", "label": "ID", "options": doctype},
-        {"fieldname": "owner", "fieldtype": "Link", "label": "Created By", "options": "User"},
-        {
-            "fieldname": "modified_by",
-            "fieldtype": "Link",
-            "label": "Last Updated By",
-            "options": "User",
-        },
-        {"fieldname": "_user_tags", "fieldtype": "Data", "label": "Tags"},
-        {"fieldname": "_liked_by", "fieldtype": "Data", "label": "Like"},
-        {"fieldname": "_comments", "fieldtype": "Text", "label": "Comments"},
-        {"fieldname": "_assign", "fieldtype": "Text", "label": "Assigned To"},
-        {"fieldname": "creation", "fieldtype": "Datetime", "label": "Created On"},
-        {"fieldname": "modified", "fieldtype": "Datetime", "label": "Last Updated On"},
-    ]
+    standard_fields = get_meta_standard_fields(doctype)
     for field in standard_fields:
         if field.get("fieldname") not in restricted_fields and field.get("fieldtype") in allowed_fieldtypes:
             field["name"] = field.get("fieldname")
             res.append(field)
 
     for field in res:
-        field["label"] = _(field.get("label"))
+        field["label"] = translate_label(field.get("label"))
         field["value"] = field.get("fieldname")
 
     return res
@@ -123,58 +209,27 @@ def get_filterable_fields(doctype: str):
 
 @frappe.whitelist(allow_guest=True)
 def get_group_by_fields(doctype: str):
-    allowed_fieldtypes = [
-        "Check",
-        "Data",
-        "Float",
-        "Int",
-        "Currency",
-        "Dynamic Link",
-        "Link",
-        "Select",
-        "Duration",
-        "Date",
-        "Datetime",
-    ]
-
     fields = frappe.get_meta(doctype).fields
-    fields = [
-        field
-        for field in fields
-        if field.fieldtype not in no_value_fields and field.fieldtype in allowed_fieldtypes
-    ]
+    # GROUP_BY_FIELDTYPES holds no no_value_fields types, one set lookup is enough
+    fields = [field for field in fields if field.fieldtype in GROUP_BY_FIELDTYPES]
     fields = [
         {
-            "label": _(field.label),
+            "label": translate_label(field.label),
             "fieldname": field.fieldname,
         }
         for field in fields
         if field.label and field.fieldname
     ]
 
-    standard_fields = [
-        {"label": "Name", "fieldname": "name"},
-        {"label": "Created On", "fieldname": "creation"},
-        {"label": "Last Modified", "fieldname": "modified"},
-        {"label": "Modified By", "fieldname": "modified_by"},
-        {"label": "Owner", "fieldname": "owner"},
-        {"label": "Liked By", "fieldname": "_liked_by"},
-        {"label": "Assigned To", "fieldname": "_assign"},
-        {"label": "Comments", "fieldname": "_comments"},
-        {"label": "Created On", "fieldname": "creation"},
-        {"label": "Modified On", "fieldname": "modified"},
-    ]
-
-    for field in standard_fields:
-        field["label"] = _(field["label"])
-        fields.append(field)
+    for field in GROUP_BY_STANDARD_FIELDS:
+        fields.append({"label": translate_label(field["label"]), "fieldname": field["fieldname"]})
 
     return fields
 
 
 def get_doctype_fields_meta(DocField, doctype, allowed_fieldtypes, restricted_fields):
     parent = "parent" if DocField._table_name == "tabDocField" else "dt"
-    return (
+    query = (
         frappe.qb.from_(DocField)
         .select(
             DocField.fieldname,
@@ -185,10 +240,12 @@ def get_doctype_fields_meta(DocField, doctype, allowed_fieldtypes, restricted_fi
         )
         .where(DocField[parent] == doctype)
         .where(DocField.hidden == False)  # noqa: E712
-        .where(Criterion.any([DocField.fieldtype == i for i in allowed_fieldtypes]))
-        .where(Criterion.all([DocField.fieldname != i for i in restricted_fields]))
-        .run(as_dict=True)
+        .where(DocField.fieldtype.isin(list(allowed_fieldtypes)))
     )
+    # NOT IN () is invalid SQL on some backends, skip the clause when nothing is restricted
+    if restricted_fields:
+        query = query.where(DocField.fieldname.notin(list(restricted_fields)))
+    return query.run(as_dict=True)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -196,10 +253,10 @@ def get_quick_filters(doctype: str, cached: bool = True):
     meta = frappe.get_meta(doctype, cached)
     quick_filters = []
 
-    if global_settings := frappe.db.exists("CRM Global Settings", {"dt": doctype, "type": "Quick Filters"}):
-        _quick_filters = frappe.db.get_value("CRM Global Settings", global_settings, "json")
-        _quick_filters = json.loads(_quick_filters) or []
-
+    if not cached:
+        clear_quick_filters_cache(doctype)
+    _quick_filters = get_saved_quick_filters(doctype)
+    if _quick_filters is not None:
         fields = []
 
         for filter in _quick_filters:
@@ -222,7 +279,7 @@ def get_quick_filters(doctype: str, cached: bool = True):
                 options.insert(0, {"label": "", "value": ""})
         quick_filters.append(
             {
-                "label": _(field.get("label")),
+                "label": translate_label(field.get("label")),
                 "fieldname": field.get("fieldname"),
                 "fieldtype": field.get("fieldtype"),
                 "options": options,
@@ -237,11 +294,14 @@ def get_quick_filters(doctype: str, cached: bool = True):
 
 @frappe.whitelist(allow_guest=True)
 def update_quick_filters(quick_filters: str, old_filters: str, doctype: str):
-    quick_filters = json.loads(quick_filters)
-    old_filters = json.loads(old_filters)
+    quick_filters = json_loads(quick_filters)
+    old_filters = json_loads(old_filters)
 
-    new_filters = [filter for filter in quick_filters if filter not in old_filters]
-    removed_filters = [filter for filter in old_filters if filter not in quick_filters]
+    # filters are fieldnames; set lookups keep the diff linear while preserving order
+    quick_filter_set = set(quick_filters)
+    old_filter_set = set(old_filters)
+    new_filters = [filter for filter in quick_filters if filter not in old_filter_set]
+    removed_filters = [filter for filter in old_filters if filter not in quick_filter_set]
 
     # update or create global quick filter settings
     create_update_global_settings(doctype, quick_filters)
@@ -255,15 +315,35 @@ def update_quick_filters(quick_filters: str, old_filters: str, doctype: str):
         update_in_standard_filter(filter, doctype, 1)
 
 
+def get_saved_quick_filters(doctype):
+    """
+    Quick filter fieldnames saved in CRM Global Settings for `doctype`, or None when the
+    doctype has no saved settings. Cached in redis, cleared by clear_quick_filters_cache.
+    """
+
+    def load():
+        _json = frappe.db.get_value("CRM Global Settings", {"dt": doctype, "type": "Quick Filters"}, "json")
+        if _json is None:
+            return None
+        return json_loads(_json) or []
+
+    return frappe.cache().hget(QUICK_FILTERS_CACHE_KEY, doctype, generator=load)
+
+
+def clear_quick_filters_cache(doctype):
+    frappe.cache().hdel(QUICK_FILTERS_CACHE_KEY, doctype)
+
+
 def create_update_global_settings(doctype, quick_filters):
     if global_settings := frappe.db.exists("CRM Global Settings", {"dt": doctype, "type": "Quick Filters"}):
-        frappe.db.set_value("CRM Global Settings", global_settings, "json", json.dumps(quick_filters))
+        frappe.db.set_value("CRM Global Settings", global_settings, "json", json_dumps(quick_filters))
+        clear_quick_filters_cache(doctype)
     else:
         # create CRM Global Settings doc
         doc = frappe.new_doc("CRM Global Settings")
         doc.dt = doctype
         doc.type = "Quick Filters"
-        doc.json = json.dumps(quick_filters)
+        doc.json = json_dumps(quick_filters)
         doc.insert()
 
 
@@ -309,14 +389,17 @@ def get_data(
     # view can come as JSON string
     if view and isinstance(view, str):
         try:
-            view = frappe.parse_json(view)
+            view = json_loads(view)
         except Exception:
             view = None
 
+    # a JSON string without "@me" can't contain the macro, skip the scan below
+    has_me_macro = "@me" in filters if isinstance(filters, str) else bool(filters)
+
     # normalize filters (can be dict, JSON string, empty, etc.)
     if isinstance(filters, str):
         # JSON string or ""
-        filters = frappe.parse_json(filters or "{}")
+        filters = json_loads(filters or "{}")
     elif isinstance(filters, dict):
         filters = filters
     elif filters in (None, "", "null"):
@@ -336,7 +419,7 @@ def get_data(
     # helpers to normalize list-like params
     def ensure_list(val):
         if isinstance(val, str):
-            return frappe.parse_json(val or "[]")
+            return json_loads(val or "[]")
         elif val is None:
             return []
         else:
@@ -350,30 +433,30 @@ def get_data(
     custom_view = False
 
     # replace @me macros in filters
-    for key in list(filters.keys()):
-        value = filters[key]
-        if isinstance(value, list):
-            if "@me" in value:
-                value[value.index("@me")] = frappe.session.user
-            elif "%@me%" in value:
-                idxs = [i for i, v in enumerate(value) if v == "%@me%"]
-                for i in idxs:
-                    value[i] = "%" + frappe.session.user + "%"
-        elif value == "@me":
-            filters[key] = frappe.session.user
+    if has_me_macro:
+        user = frappe.session.user
+        macros = {"@me": user, "%@me%": f"%{user}%"}
+        for key, value in filters.items():
+            if isinstance(value, list):
+                filters[key] = [macros.get(v, v) if isinstance(v, str) else v for v in value]
+            elif value == "@me":
+                filters[key] = user
 
     # merge default_filters if provided
     if default_filters:
         if isinstance(default_filters, str):
-            default_filters = frappe.parse_json(default_filters)
+            default_filters = json_loads(default_filters)
         filters.update(default_filters)
 
     is_default = True
     data = []
+    # rows the list query returned, before parse_list_data can add or drop any
+    fetched_count = 0
+    # resolve controller, meta and default list data once for the whole request
     _list = get_controller(doctype)
-    default_rows = []
-    if hasattr(_list, "default_list_data"):
-        default_rows = _list.default_list_data().get("rows")
+    has_default_list_data = hasattr(_list, "default_list_data")
+    default_list_data = _list.default_list_data() if has_default_list_data else {}
+    default_rows = default_list_data.get("rows") or []
 
     meta = frappe.get_meta(doctype)
 
@@ -385,25 +468,7 @@ def get_data(
     if view_type != "kanban":
         # تحديث المهام المتأخرة قبل قراءة البيانات (لـ CRM Task فقط)
         if doctype == "CRM Task":
-            try:
-                from frappe.utils import now_datetime
-                current_dt = now_datetime()
-                # تحديث مباشر في قاعدة البيانات
-                frappe.db.sql(
-                    """
-                    UPDATE `tabCRM Task`
-                    SET status = 'late'
-                    WHERE due_date < %s
-                    AND status NOT IN ('Done', 'late')
-                    AND due_date IS NOT NULL
-                """,
-                    (current_dt,),
-                    as_dict=False,
-                )
-                frappe.db.commit()
-            except Exception as e:
-                frappe.log_error(f"Error updating overdue tasks in list view: {str(e)}")
-                pass
+            mark_overdue_tasks()
 
         if columns or rows:
             custom_view = True
@@ -427,51 +492,35 @@ def get_data(
 
         if not custom_view and frappe.db.exists("CRM View Settings", default_view_filters):
             list_view_settings = frappe.get_doc("CRM View Settings", default_view_filters)
-            columns = frappe.parse_json(list_view_settings.columns)
-            rows = frappe.parse_json(list_view_settings.rows)
+            columns = json_loads(list_view_settings.columns)
+            rows = json_loads(list_view_settings.rows)
             is_default = False
-        elif not custom_view or (is_default and hasattr(_list, "default_list_data")):
+        elif not custom_view or (is_default and has_default_list_data):
             rows = default_rows
-            columns = _list.default_list_data().get("columns")
-
-        # ensure rows contains all column keys
-        for column in list(columns):
-            if column.get("key") not in rows:
-                rows.append(column.get("key"))
-            column["label"] = _(column.get("label"))
-
-            if column.get("key") == "_liked_by" and column.get("width") == "10rem":
+            columns = default_list_data.get("columns")
+
+        # ensure rows contains all column keys and drop hidden columns, touching each column once
+        existing_rows = set(rows)
+        visible_columns = []
+        for column in columns:
+            key = column.get("key")
+            if key not in existing_rows:
+                existing_rows.add(key)
+                rows.append(key)
+            column["label"] = translate_label(column.get("label"))
+
+            if key == "_liked_by" and column.get("width") == "10rem":
                 column["width"] = "50px"
 
-            # remove hidden columns
-            column_meta = meta.get_field(column.get("key"))
-            if column_meta and column_meta.get("hidden"):
-                columns.remove(column)
+            column_meta = meta.get_field(key)
+            if not (column_meta and column_meta.get("hidden")):
+                visible_columns.append(column)
+        columns = visible_columns
 
         # ensure group_by_field is included in rows
         if group_by_field and group_by_field not in rows:
             rows.append(group_by_field)
 
-        # لـ CRM Task: تحديث قاعدة البيانات أولاً ثم قراءة البيانات
-        if doctype == "CRM Task":
-            from frappe.utils import now_datetime
-            current_dt = now_datetime()
-            try:
-                frappe.db.sql(
-                    """
-                    UPDATE `tabCRM Task`
-                    SET status = 'late'
-                    WHERE due_date < %s
-                    AND status NOT IN ('Done', 'late')
-                    AND due_date IS NOT NULL
-                """,
-                    (current_dt,),
-                )
-                frappe.db.commit()
-                frappe.clear_cache(doctype="CRM Task")
-            except Exception as e:
-                frappe.log_error(f"Error updating overdue tasks: {str(e)}")
-
         data = (
             frappe.get_list(
                 doctype,
@@ -482,37 +531,21 @@ def get_data(
             )
             or []
         )
-        data = parse_list_data(data, doctype)
+        fetched_count = len(data)
+        if hasattr(_list, "parse_list_data"):
+            data = _list.parse_list_data(data)
 
     # ---------- KANBAN VIEW ----------
     if view_type == "kanban":
         # تحديث المهام المتأخرة قبل قراءة البيانات (لـ CRM Task فقط)
         if doctype == "CRM Task":
-            try:
-                from frappe.utils import now_datetime
-                current_dt = now_datetime()
-                frappe.db.sql(
-                    """
-                    UPDATE `tabCRM Task`
-                    SET status = 'late'
-                    WHERE due_date < %s
-                    AND status NOT IN ('Done', 'late')
-                    AND due_date IS NOT NULL
-                """,
-                    (current_dt,),
-                    as_dict=False,
-                )
-                frappe.db.commit()
-                frappe.clear_cache(doctype="CRM Task")
-            except Exception as e:
-                frappe.log_error(f"Error updating overdue tasks in kanban view: {str(e)}")
-                pass
+            mark_overdue_tasks()
 
         if not rows:
             rows = default_rows
 
         if not kanban_columns and column_field:
-            field_meta = frappe.get_meta(doctype).get_field(column_field)
+            field_meta = meta.get_field(column_field)
             if field_meta.fieldtype == "Link":
                 kanban_columns = frappe.get_all(
                     field_meta.options,
@@ -522,6 +555,20 @@ def get_data(
             elif field_meta.fieldtype == "Select":
                 kanban_columns = [{"name": option} for option in field_meta.options.split("\n")]
 
+        # all_count for every column in one GROUP BY instead of one COUNT(*) per column
+        column_counts = {}
+        if column_field:
+            column_counts = {
+                d.get(column_field): d.total_count
+                for d in frappe.get_list(
+                    doctype,
+                    filters=convert_filter_to_tuple(doctype, filters) if filters else [],
+                    fields=[column_field, "count(*) as total_count"],
+                    group_by=column_field,
+                    order_by=f"{column_field} asc",
+                )
+            }
+
         if not title_field:
             title_field = "name"
             if hasattr(_list, "default_kanban_settings"):
@@ -533,12 +580,35 @@ def get_data(
         if not kanban_fields:
             kanban_fields = ["name"]
             if hasattr(_list, "default_kanban_settings"):
-                kanban_fields = json.loads(_list.default_kanban_settings().get("kanban_fields"))
+                kanban_fields = json_loads(_list.default_kanban_settings().get("kanban_fields"))
 
+        existing_rows = set(rows)
         for field in kanban_fields:
-            if field not in rows:
+            if field not in existing_rows:
+                existing_rows.add(field)
                 rows.append(field)
 
+        # rows of every plain (not hand-ordered) column in one ranked query
+        column_rows = None
+        if column_field:
+            max_page_length = max(
+                (
+                    cint(kc.get("page_length", 20))
+                    for kc in kanban_columns
+                    if kc.get("name") and not kc.get("delete") and not kc.get("order")
+                ),
+                default=0,
+            )
+            if max_page_length:
+                column_rows = get_kanban_column_data(
+                    doctype,
+                    rows,
+                    convert_filter_to_tuple(doctype, filters) if filters else [],
+                    column_field,
+                    order_by,
+                    max_page_length,
+                )
+
         for kc in kanban_columns:
             # Start with base filters
             column_filters = []
@@ -562,6 +632,8 @@ def get_data(
                     column_data = get_records_based_on_order(
                         doctype, rows, column_filters, col_page_length, order
                     )
+                elif column_rows is not None and kc.get("name"):
+                    column_data = column_rows.get(kc.get("name"), [])[: cint(col_page_length)]
                 else:
                     column_data = frappe.get_list(
                         doctype,
@@ -571,58 +643,52 @@ def get_data(
                         page_length=col_page_length,
                     )
 
-                all_count = frappe.get_list(
-                    doctype,
-                    filters=column_filters,
-                    fields="count(*) as total_count",
-                )[0].total_count
+                if column_field and kc.get("name"):
+                    all_count = column_counts.get(kc.get("name"), 0)
+                elif column_field:
+                    all_count = sum(column_counts.values())
+                else:
+                    all_count = frappe.get_list(
+                        doctype,
+                        filters=column_filters,
+                        fields="count(*) as total_count",
+                    )[0].total_count
 
                 kc["all_count"] = all_count
                 kc["count"] = len(column_data)
 
             if order:
+                order_idx = {n: i for i, n in enumerate(order)}
                 column_data = sorted(
                     column_data,
-                    key=lambda x: order.index(x.get("name")) if x.get("name") in order else len(order),
+                    key=lambda x: order_idx.get(x.get("name"), len(order)),
                 )
 
             data.append({"column": kc, "fields": kanban_fields, "data": column_data})
 
     # ---------- FIELD META ----------
-    fields = frappe.get_meta(doctype).fields
-    fields = [field for field in fields if field.fieldtype not in no_value_fields]
+    # one walk over the meta, shared by every view type
     fields = [
         {
-            "label": _(field.label),
+            "label": translate_label(field.label),
             "fieldtype": field.fieldtype,
             "fieldname": field.fieldname,
             "options": field.options,
         }
-        for field in fields
-        if field.label and field.fieldname
+        for field in meta.fields
+        if field.fieldtype not in NO_VALUE_FIELDTYPES and field.label and field.fieldname
     ]
 
-    std_fields = [
-        {"label": "Name", "fieldtype": "Data", "fieldname": "name"},
-        {"label": "Created On", "fieldtype": "Datetime", "fieldname": "creation"},
-        {"label": "Last Modified", "fieldtype": "Datetime", "fieldname": "modified"},
-        {
-            "label": "Modified By",
-            "fieldtype": "Link",
-            "fieldname": "modified_by",
-            "options": "User",
-        },
-        {"label": "Assigned To", "fieldtype": "Text", "fieldname": "_assign"},
-        {"label": "Owner", "fieldtype": "Link", "fieldname": "owner", "options": "User"},
-        {"label": "Like", "fieldtype": "Data", "fieldname": "_liked_by"},
-    ]
-
-    for field in std_fields:
-        if field.get("fieldname") not in rows:
-            rows.append(field.get("fieldname"))
-        if field not in fields:
-            field["label"] = _(field["label"])
-            fields.append(field)
+    existing_rows = set(rows)
+    existing_fieldnames = {field["fieldname"] for field in fields}
+    for field in DATA_STANDARD_FIELDS:
+        fieldname = field["fieldname"]
+        if fieldname not in existing_rows:
+            existing_rows.add(fieldname)
+            rows.append(fieldname)
+        if fieldname not in existing_fieldnames:
+            existing_fieldnames.add(fieldname)
+            fields.append(dict(field, label=translate_label(field["label"])))
 
     if not is_default and custom_view_name:
         is_default = frappe.db.get_value("CRM View Settings", custom_view_name, "load_default_columns")
@@ -633,9 +699,14 @@ def get_data(
             if type == "Select":
                 return [option for option in options.split("\n")]
             else:
-                has_empty_values = any([not d.get(group_by_field) for d in data])
-                opts = list(set([d.get(group_by_field) for d in data]))
-                opts = [u for u in opts if u]
+                # options over every matching row, not just the rows on this page
+                opts = []
+                has_empty_values = False
+                for value in get_distinct_group_by_values(doctype, group_by_field, filters):
+                    if value:
+                        opts.append(value)
+                    else:
+                        has_empty_values = True
                 if has_empty_values:
                     opts.append("")
 
@@ -661,6 +732,16 @@ def get_data(
                     "options": get_options(field.get("fieldtype"), field.get("options")),
                 }
 
+    # The list query always reads from the first row ("load more" raises page_length, there
+    # is no offset), so a page shorter than page_length already holds every matching row and
+    # the extra COUNT(*) is only needed when the page is full (or for kanban)
+    if view_type != "kanban" and fetched_count < cint(page_length):
+        total_count = fetched_count
+    else:
+        total_count = frappe.get_list(doctype, filters=filters, fields="count(*) as total_count")[
+            0
+        ].total_count
+
     return {
         "data": data,
         "columns": columns,
@@ -675,9 +756,7 @@ def get_data(
         "page_length_count": page_length_count,
         "is_default": is_default,
         "views": get_views(doctype),
-        "total_count": frappe.get_list(
-            doctype, filters=filters, fields="count(*) as total_count"
-        )[0].total_count,
+        "total_count": total_count,
         "row_count": len(data),
         "form_script": get_form_script(doctype),
         "list_script": get_form_script(doctype, "List"),
@@ -685,6 +764,72 @@ def get_data(
     }
 
 
+def translate_label(label):
+    """
+    `_(label)` memoized for the current request. Meta walks translate the same labels
+    (standard fields, repeated columns) over and over; the memo lives on frappe.local so
+    it never outlives the request or leaks across languages.
+    """
+    if not label:
+        return _(label)
+    memo = getattr(frappe.local, "crm_label_translations", None)
+    if memo is None:
+        memo = frappe.local.crm_label_translations = {}
+    key = (frappe.local.lang, label)
+    if key not in memo:
+        memo[key] = _(label)
+    return memo[key]
+
+
+def get_distinct_group_by_values(doctype, group_by_field, filters):
+    """Distinct values of `group_by_field` across all rows matching `filters` (permission aware)."""
+    return frappe.get_list(
+        doctype,
+        filters=filters,
+        fields=[group_by_field],
+        distinct=True,
+        order_by=f"{group_by_field} asc",
+        pluck=group_by_field,
+    )
+
+
+def mark_overdue_tasks():
+    """
+    Flip past-due CRM Tasks to 'late'.
+
+    Runs at most once per OVERDUE_TASKS_CHECK_TTL seconds per site, so concurrent list and
+    kanban loads don't each issue the same UPDATE + commit. A cheap indexed EXISTS probe on
+    (status, due_date) decides whether the UPDATE, commit and cache flush are needed at all.
+    """
+    cache = frappe.cache()
+    if cache.get_value(OVERDUE_TASKS_CHECK_KEY):
+        return
+
+    try:
+        now = now_datetime()
+        if frappe.db.exists(
+            "CRM Task", {"due_date": ["<", now], "status": ["not in", ["Done", "late"]]}
+        ):
+            frappe.db.sql(
+                """
+                UPDATE `tabCRM Task`
+                SET status = 'late'
+                WHERE due_date < %s
+                AND status NOT IN ('Done', 'late')
+                AND due_date IS NOT NULL
+            """,
+                (now,),
+            )
+            frappe.db.commit()
+            frappe.clear_cache(doctype="CRM Task")
+    except Exception as e:
+        frappe.log_error(f"Error updating overdue tasks: {str(e)}")
+        return
+
+    # only once the sweep went through, so a failed one is retried on the next load
+    cache.set_value(OVERDUE_TASKS_CHECK_KEY, 1, expires_in_sec=OVERDUE_TASKS_CHECK_TTL)
+
+
 def parse_list_data(data, doctype):
     _list = get_controller(doctype)
     if hasattr(_list, "parse_list_data"):
@@ -701,66 +846,117 @@ def convert_filter_to_tuple(doctype, filters):
     return filters
 
 
+def get_kanban_column_data(doctype, rows, filters, column_field, order_by, page_length):
+    """
+    Top `page_length` rows of every kanban column in a single query.
+
+    The permission-aware list query is built by frappe.get_list (run=0) and ranked per
+    column with ROW_NUMBER(), so the board costs one round-trip instead of one per column.
+    The wrapper takes no query parameters, so the generated SQL is used exactly as built.
+    Returns {column value: [rows]}.
+    """
+    order_fields = []
+    for part in (order_by or "modified desc").split(","):
+        match = _ORDER_BY_PART_RE.fullmatch(part)
+        if not match:
+            frappe.throw(_("Unsupported order_by for kanban query: {0}").format(order_by))
+        order_fields.append((match.group(1), (match.group(2) or "asc").lower()))
+
+    fields = list(dict.fromkeys([*rows, column_field, *(f for f, _d in order_fields)]))
+    extra_fields = [f for f in fields if f not in rows]
+
+    query = frappe.get_list(
+        doctype,
+        fields=fields,
+        filters=filters,
+        order_by=order_by,
+        page_length=0,
+        run=0,
+    )
+    window_order = ", ".join(f"t.`{f}` {d}" for f, d in order_fields)
+    ranked = frappe.db.sql(
+        f"""
+        SELECT * FROM (
+            SELECT t.*, ROW_NUMBER() OVER (PARTITION BY t.`{column_field}` ORDER BY {window_order}) AS _kanban_rank
+            FROM ({query}) t
+        ) ranked
+        WHERE _kanban_rank <= {cint(page_length)}
+        ORDER BY _kanban_rank
+        """,
+        as_dict=True,
+    )
+
+    column_rows = defaultdict(list)
+    for row in ranked:
+        key = row.get(column_field)
+        row.pop("_kanban_rank", None)
+        for f in extra_fields:
+            row.pop(f, None)
+        column_rows[key].append(row)
+    return column_rows
+
+
 def get_records_based_on_order(doctype, rows, filters, page_length, order):
-    records = []
+    """
+    Rows of a hand-ordered kanban column: the first `page_length` names of `order` in that
+    order, topped up with rows that aren't in `order` (newest first), in a single query.
+    """
     filters = convert_filter_to_tuple(doctype, filters)
-    in_filters = filters.copy()
-    in_filters.append([doctype, "name", "in", order[:page_length]])
-    records = frappe.get_list(
+    page_length = cint(page_length)
+    ranked = order[:page_length]
+
+    or_filters = [[doctype, "name", "not in", order]]
+    if ranked:
+        or_filters.append([doctype, "name", "in", ranked])
+
+    fields = list(dict.fromkeys([*rows, "name", "creation"]))
+    extra_fields = [f for f in fields if f not in rows]
+    query = frappe.get_list(
         doctype,
-        fields=rows,
-        filters=in_filters,
+        fields=fields,
+        filters=filters,
+        or_filters=or_filters,
         order_by="creation desc",
-        page_length=page_length,
+        page_length=0,
+        run=0,
     )
 
-    if len(records) < page_length:
-        not_in_filters = filters.copy()
-        not_in_filters.append([doctype, "name", "not in", order])
-        remaining_records = frappe.get_list(
-            doctype,
-            fields=rows,
-            filters=not_in_filters,
-            order_by="creation desc",
-            page_length=page_length - len(records),
+    # CASE instead of MariaDB's FIELD() so the ranking also works on Postgres. The names
+    # are escaped inline: the wrapper takes no query parameters, so the generated SQL is
+    # used exactly as built
+    rank_order = ""
+    if ranked:
+        whens = " ".join(
+            f"WHEN {frappe.db.escape(str(name), percent=False)} THEN {i}" for i, name in enumerate(ranked)
         )
-        for record in remaining_records:
-            records.append(record)
-
+        rank_order = f"CASE t.`name` {whens} ELSE {len(ranked)} END, "
+
+    records = frappe.db.sql(
+        f"""
+        SELECT * FROM ({query}) t
+        ORDER BY {rank_order}t.`creation` DESC
+        LIMIT {page_length}
+        """,
+        as_dict=True,
+    )
+    for record in records:
+        for f in extra_fields:
+            record.pop(f, None)
     return records
 
 
 @frappe.whitelist(allow_guest=True)
 def get_fields_meta(doctype, restricted_fieldtypes=None, as_array=False, only_required=False):
-    not_allowed_fieldtypes = [
-        "Tab Break",
-        "Section Break",
-        "Column Break",
-    ]
+    not_allowed_fieldtypes = LAYOUT_FIELDTYPES
 
     if restricted_fieldtypes:
-        restricted_fieldtypes = frappe.parse_json(restricted_fieldtypes)
-        not_allowed_fieldtypes += restricted_fieldtypes
+        restricted_fieldtypes = frozenset(json_loads(restricted_fieldtypes))
+        not_allowed_fieldtypes = not_allowed_fieldtypes | restricted_fieldtypes
 
     fields = frappe.get_meta(doctype).fields
     fields = [field for field in fields if field.fieldtype not in not_allowed_fieldtypes]
 
-    standard_fields = [
-        {"fieldname": "name", "fieldtype": "Link", "label": "ID", "options": doctype},
-        {"fieldname": "owner", "fieldtype": "Link", "label": "Created By", "options": "User"},
-        {
-            "fieldname": "modified_by",
-            "fieldtype": "Link",
-            "label": "Last Updated By",
-            "options": "User",
-        },
-        {"fieldname": "_user_tags", "fieldtype": "Data", "label": "Tags"},
-        {"fieldname": "_liked_by", "fieldtype": "Data", "label": "Like"},
-        {"fieldname": "_comments", "fieldtype": "Text", "label": "Comments"},
-        {"fieldname": "_assign", "fieldtype": "Text", "label": "Assigned To"},
-        {"fieldname": "creation", "fieldtype": "Datetime", "label": "Created On"},
-        {"fieldname": "modified", "fieldtype": "Datetime", "label": "Last Updated On"},
-    ]
+    standard_fields = get_meta_standard_fields(doctype)
 
     for field in standard_fields:
         if not restricted_fieldtypes or field.get("fieldtype") not in restricted_fieldtypes:
@@ -786,7 +982,7 @@ def get_fields_meta(doctype, restricted_fieldtypes=None, as_array=False, only_re
 def remove_assignments(doctype, name, assignees, ignore_permissions=False):
     # Handle both JSON string and already-decoded list
     if isinstance(assignees, str):
-        assignees = json.loads(assignees)
+        assignees = json_loads(assignees)
     elif not isinstance(assignees, list):
         frappe.throw(_("assignees must be a list or JSON string"))
 
@@ -811,53 +1007,85 @@ def remove_multiple_assignments(doctype, names, ignore_permissions=False):
     Used when clearing assignments from bulk operations.
     """
     if isinstance(names, str):
-        names = json.loads(names)
+        names = json_loads(names)
     elif not isinstance(names, list):
         frappe.throw(_("names must be a list or JSON string"))
 
     if not names:
         return
 
-    # Get all ToDo records for these documents
+    # Same permission gate set_status applied per document, in one permission-aware query
+    if not ignore_permissions:
+        permitted = set(frappe.get_list(doctype, filters={"name": ["in", names]}, pluck="name"))
+        if denied := [n for n in names if n not in permitted]:
+            frappe.throw(
+                _("Not permitted to remove assignments from {0}").format(", ".join(denied)),
+                frappe.PermissionError,
+            )
+
+    # Open assignments of these documents, Closed ToDos are left as they are
     todos = frappe.get_all(
         "ToDo",
         filters={
             "reference_type": doctype,
             "reference_name": ["in", names],
-            "status": ["!=", "Cancelled"],
+            "status": "Open",
         },
         fields=["name", "allocated_to", "reference_name"],
     )
+    if not todos:
+        return {"ok": True, "count": 0}
 
-    # Cancel all ToDo records
-    # Cancel all ToDo records
+    todos_by_doc = defaultdict(list)
     for todo in todos:
-        set_status(
-            doctype,
-            todo["reference_name"],
-            todo=todo["name"],
-            assign_to=todo["allocated_to"],
-            status="Cancelled",
-            ignore_permissions=ignore_permissions,
-        )
+        todos_by_doc[todo.reference_name].append(todo)
+
+    # set_status runs the whole ToDo lifecycle (timeline comment, _assign/assigned_to
+    # refresh, frappe's assignment notification, ToDo doc_events); only the CRM
+    # notifications are deferred and sent for the whole batch below
+    cancelled = []
+    with _temporary_flags(crm_defer_assignment_notifications=True):
+        for reference_name, doc_todos in todos_by_doc.items():
+            # a document's assignments are removed together or not at all
+            frappe.db.savepoint("remove_multiple_assignments")
+            try:
+                for todo in doc_todos:
+                    set_status(
+                        doctype,
+                        reference_name,
+                        todo=todo.name,
+                        assign_to=todo.allocated_to,
+                        status="Cancelled",
+                        ignore_permissions=ignore_permissions,
+                    )
+            except Exception:
+                frappe.db.rollback(save_point="remove_multiple_assignments")
+                frappe.log_error(frappe.get_traceback(), "remove_multiple_assignments error")
+                continue
+            cancelled.extend(doc_todos)
 
-    return {"ok": True, "count": len(todos)}
+    notify_cancelled_assignments(doctype, cancelled)
+
+    return {"ok": True, "count": len(cancelled)}
 
 
 @frappe.whitelist(allow_guest=True)
 def get_assigned_users(doctype, name, default_assigned_to=None):
-    assigned_users = frappe.get_all(
-        "ToDo",
-        fields=["allocated_to"],
-        filters={
-            "reference_type": doctype,
-            "reference_name": name,
-            "status": ("!=", "Cancelled"),
-        },
-        pluck="allocated_to",
-    )
+    # list renders ask for the same document repeatedly, memoize for this request
+    cache = frappe.local.flags.setdefault("crm_assigned_users", {})
+    if (doctype, name) not in cache:
+        ToDo = frappe.qb.DocType("ToDo")
+        cache[(doctype, name)] = (
+            frappe.qb.from_(ToDo)
+            .select(ToDo.allocated_to)
+            .distinct()
+            .where(ToDo.reference_type == doctype)
+            .where(ToDo.reference_name == name)
+            .where(ToDo.status != "Cancelled")
+            .run(pluck=True)
+        )
 
-    users = list(set(assigned_users))
+    users = list(cache[(doctype, name)])
 
     # if users is empty, add default_assigned_to
     if not users and default_assigned_to:
@@ -865,6 +1093,41 @@ def get_assigned_users(doctype, name, default_assigned_to=None):
     return users
 
 
+@contextmanager
+def _temporary_flags(**flags):
+    """Set frappe.flags for the duration of the block, then restore (or drop) the previous values."""
+    missing = object()
+    previous = {key: frappe.flags.get(key, missing) for key in flags}
+    frappe.flags.update(flags)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is missing:
+                frappe.flags.pop(key, None)
+            else:
+                frappe.flags[key] = value
+
+
+def _coerce_str_list(value):
+    """
+    `value` as a list of non-empty strings. Accepts a list/tuple, a JSON list or string,
+    or a bare scalar such as a single docname; only input that looks like JSON is parsed.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value[:1] in ("[", '"'):
+            try:
+                value = json_loads(value)
+            except ValueError:
+                pass
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value if v]
+    return [str(value)] if value else []
+
+
 # -----------------------------
 # FIXED for Frappe v15
 # - frappe.has_permission() does NOT accept name=
@@ -888,148 +1151,231 @@ def assign_without_rule(
 
     frappe.logger("crm").debug(f"assign_without_rule started: doctype={doctype}, names={names}, assign_to={assign_to}")
 
-    # Normalize assign_to to a list of strings
-    if isinstance(assign_to, str):
-        try:
-            assign_to = frappe.parse_json(assign_to)
-        except Exception:
-            assign_to = [assign_to]
-    if not isinstance(assign_to, list):
-        assign_to = [assign_to] if assign_to else []
-
-    users = [str(u) for u in assign_to if u]
+    # deduplicated, first occurrence wins
+    users = list(dict.fromkeys(_coerce_str_list(assign_to)))
     if not users:
         frappe.throw(_("assign_to is required and cannot be empty"))
 
-    # Normalize doc_names to a list of strings
-    doc_names = []
-    if name:
-        doc_names.append(name)
-    
-    if names:
-        if isinstance(names, str):
-            try:
-                parsed_names = frappe.parse_json(names)
-                if isinstance(parsed_names, list):
-                    doc_names.extend([str(n) for n in parsed_names if n])
-                else:
-                    doc_names.append(str(parsed_names))
-            except Exception:
-                doc_names.append(names)
-        elif isinstance(names, list):
-            doc_names.extend([str(n) for n in names if n])
-        else:
-            doc_names.append(str(names))
+    doc_names = ([str(name)] if name else []) + _coerce_str_list(names)
 
-    # Deduplicate
-    doc_names = list(set([n for n in doc_names if n]))
+    # Deduplicate, keeping the request order for logs and deterministic IN lists
+    doc_names = list(dict.fromkeys(n for n in doc_names if n))
 
     if not doc_names:
         frappe.throw(_("Document name(s) required (name or names parameter)"), frappe.ValidationError)
 
-    # -------------------------
-    # Assign using standard assign_to.add
-    # -------------------------
-    from frappe.desk.form.assign_to import add as add_assignment
-
-    original_flag = getattr(frappe.flags, "ignore_assign_rule", None)
-    frappe.flags.ignore_assign_rule = True
-
     assigned_count = 0
     skipped_no_permission = 0
 
+    # read permission for the whole batch in one permission-aware query
+    permitted_names = doc_names
+    if not ignore_permissions:
+        permitted = set(
+            frappe.get_list(doctype, filters={"name": ["in", doc_names]}, pluck="name", page_length=0)
+        )
+        permitted_names = [n for n in doc_names if n in permitted]
+        skipped_no_permission = len(doc_names) - len(permitted_names)
+
+    result = {
+        "ok": True,
+        "assigned_to": users,
+        "assigned_count": assigned_count,
+        "skipped_no_permission": skipped_no_permission,
+        "doc_names": doc_names,
+    }
+    # nothing readable to assign, skip the flag handling and ToDo queries altogether
+    if not permitted_names:
+        return result
+
+    # -------------------------
+    # Assign using standard assign_to.add
+    # -------------------------
+    # failures are collected and written as a single Error Log after the loop
+    errors = []
     try:
-        for doc_name in doc_names:
-            if not ignore_permissions:
-                if not frappe.has_permission(doctype, "read", doc=doc_name):
-                    skipped_no_permission += 1
+        # CRM assignment notifications are sent for the whole batch after the loop
+        with _temporary_flags(ignore_assign_rule=True, crm_defer_assignment_notifications=True):
+            # open ToDos that already cover a (doc, user) pair, fetched once for the whole batch
+            existing_todos = frappe.get_all(
+                "ToDo",
+                filters={
+                    "reference_type": doctype,
+                    "reference_name": ["in", permitted_names],
+                    "allocated_to": ["in", users],
+                    "status": "Open",
+                },
+                fields=["reference_name", "allocated_to"],
+            )
+            already_assigned = defaultdict(set)
+            for todo in existing_todos:
+                already_assigned[todo.reference_name].add(todo.allocated_to)
+
+            for doc_name in permitted_names:
+                # one assign_to.add call per document for all of its missing users
+                # (it still runs the ToDo hooks, notifications and _assign update)
+                pending_users = [u for u in users if u not in already_assigned[doc_name]]
+                if not pending_users:
                     continue
 
-            for user in users:
+                assign_args = {
+                    "doctype": doctype,
+                    "name": doc_name,
+                    "description": description or "",
+                    "notify": 1,
+                }
+                frappe.db.savepoint("assign_without_rule")
                 try:
-                    add_assignment(
-                        {
-                            "doctype": doctype,
-                            "name": doc_name,
-                            "assign_to": [user],
-                            "description": description or "",
-                            "notify": 1,
-                        }
-                    )
-                    assigned_count += 1
-                except Exception as e:
-                    frappe.log_error(
-                        title="assign_without_rule error",
-                        message=f"Failed to assign {doctype} {doc_name} to {user}: {str(e)}"
-                    )
+                    add_assignment({**assign_args, "assign_to": pending_users})
+                    assigned_count += len(pending_users)
+                except Exception:
+                    # one user failed the whole call: undo it and assign one by one,
+                    # so the other users of this document are still assigned
+                    frappe.db.rollback(save_point="assign_without_rule")
+                    for user in pending_users:
+                        try:
+                            add_assignment({**assign_args, "assign_to": [user]})
+                            assigned_count += 1
+                        except Exception as e:
+                            errors.append(f"{doctype} {doc_name} -> {user}: {str(e)}")
     except Exception as ge:
         frappe.log_error(frappe.get_traceback(), "assign_without_rule global error")
         raise ge
-    finally:
-        if original_flag is None:
-            if hasattr(frappe.flags, "ignore_assign_rule"):
-                delattr(frappe.flags, "ignore_assign_rule")
-        else:
-            frappe.flags.ignore_assign_rule = original_flag
 
-    return {
-        "ok": True,
-        "assigned_to": users,
-        "assigned_count": assigned_count,
-        "skipped_no_permission": skipped_no_permission,
-        "doc_names": doc_names,
-    }
+    # ToDos created by this call = open ToDos now minus the ones that existed before
+    if assigned_count:
+        new_todos = [
+            todo
+            for todo in frappe.get_all(
+                "ToDo",
+                filters={
+                    "reference_type": doctype,
+                    "reference_name": ["in", permitted_names],
+                    "allocated_to": ["in", users],
+                    "status": "Open",
+                },
+                fields=["reference_name", "allocated_to"],
+            )
+            if todo.allocated_to not in already_assigned[todo.reference_name]
+        ]
+        if new_todos:
+            frappe.enqueue(
+                "crm.api.todo.notify_assignments",
+                queue="short",
+                enqueue_after_commit=True,
+                reference_type=doctype,
+                todos=new_todos,
+            )
+
+    if errors:
+        frappe.log_error(
+            title="assign_without_rule error",
+            message="\n".join(errors)[:ASSIGN_ERROR_LOG_MAX_LENGTH],
+        )
+
+    result["assigned_count"] = assigned_count
+    return result
 
 
 @frappe.whitelist(allow_guest=True)
 def get_fields(doctype: str, allow_all_fieldtypes: bool = False):
-    not_allowed_fieldtypes = [*list(frappe.model.no_value_fields), "Read Only"]
-    if allow_all_fieldtypes:
-        not_allowed_fieldtypes = []
+    # full DocFields are returned on purpose: the settings forms read reqd, read_only,
+    # depends_on, description etc. from them
     fields = frappe.get_meta(doctype).fields
+    if allow_all_fieldtypes:
+        return [field for field in fields if field.fieldname]
+    return [
+        field
+        for field in fields
+        if field.fieldtype not in GET_FIELDS_EXCLUDED_FIELDTYPES and field.fieldname
+    ]
 
-    _fields = []
-
-    for field in fields:
-        if field.fieldtype not in not_allowed_fieldtypes and field.fieldname:
-            _fields.append(field)
 
-    return _fields
+def getCounts(d, doctype, mode="count"):
+    if mode == "badge":
+        return getBadges(d, doctype)
+    return get_counts([d], doctype)[0]
 
 
-def getCounts(d, doctype):
-    d["_email_count"] = (
-        frappe.db.count(
-            "Communication",
-            filters={
-                "reference_doctype": doctype,
-                "reference_name": d.get("name"),
-                "communication_type": "Communication",
-            },
+def getBadges(d, doctype):
+    """
+    Like getCounts, but each count is only 1 or 0 (has / has no activity) for places that
+    just render an icon; every check is an EXISTS-style lookup that stops at the first row.
+    """
+    name = d.get("name")
+    d["_email_count"] = int(
+        bool(
+            frappe.db.exists(
+                "Communication",
+                {
+                    "reference_doctype": doctype,
+                    "reference_name": name,
+                    "communication_type": ["in", ["Communication", "Automated Message"]],
+                },
+            )
         )
-        or 0
     )
-    d["_email_count"] = d["_email_count"] + frappe.db.count(
-        "Communication",
-        filters={
-            "reference_doctype": doctype,
-            "reference_name": d.get("name"),
-            "communication_type": "Automated Message",
-        },
-    )
-    d["_comment_count"] = frappe.db.count(
-        "Comment",
-        filters={"reference_doctype": doctype, "reference_name": d.get("name"), "comment_type": "Comment"},
+    d["_comment_count"] = int(
+        bool(
+            frappe.db.exists(
+                "Comment", {"reference_doctype": doctype, "reference_name": name, "comment_type": "Comment"}
+            )
+        )
     )
-    d["_task_count"] = frappe.db.count(
-        "CRM Task", filters={"reference_doctype": doctype, "reference_docname": d.get("name")}
+    d["_task_count"] = int(
+        bool(frappe.db.exists("CRM Task", {"reference_doctype": doctype, "reference_docname": name}))
     )
-    d["_note_count"] = frappe.db.count(
-        "FCRM Note", filters={"reference_doctype": doctype, "reference_docname": d.get("name")}
+    d["_note_count"] = int(
+        bool(frappe.db.exists("FCRM Note", {"reference_doctype": doctype, "reference_docname": name}))
     )
     return d
 
 
+def get_counts(docs, doctype):
+    """
+    Set _email_count, _comment_count, _task_count and _note_count on every row of `docs`
+    with one UNION ALL query grouped by reference name, instead of five COUNTs per row.
+    """
+    names = tuple({d.get("name") for d in docs if d.get("name")})
+    counts = defaultdict(dict)
+    if names:
+        for row in frappe.db.sql(
+            """
+            SELECT 'email' AS kind, reference_name AS ref, COUNT(*) AS cnt
+            FROM `tabCommunication`
+            WHERE reference_doctype = %(doctype)s AND reference_name IN %(names)s
+                AND communication_type IN ('Communication', 'Automated Message')
+            GROUP BY reference_name
+            UNION ALL
+            SELECT 'comment', reference_name, COUNT(*)
+            FROM `tabComment`
+            WHERE reference_doctype = %(doctype)s AND reference_name IN %(names)s
+                AND comment_type = 'Comment'
+            GROUP BY reference_name
+            UNION ALL
+            SELECT 'task', reference_docname, COUNT(*)
+            FROM `tabCRM Task`
+            WHERE reference_doctype = %(doctype)s AND reference_docname IN %(names)s
+            GROUP BY reference_docname
+            UNION ALL
+            SELECT 'note', reference_docname, COUNT(*)
+            FROM `tabFCRM Note`
+            WHERE reference_doctype = %(doctype)s AND reference_docname IN %(names)s
+            GROUP BY reference_docname
+            """,
+            {"doctype": doctype, "names": names},
+            as_dict=True,
+        ):
+            counts[row.ref][row.kind] = row.cnt
+
+    for d in docs:
+        doc_counts = counts.get(d.get("name"), {})
+        d["_email_count"] = doc_counts.get("email", 0)
+        d["_comment_count"] = doc_counts.get("comment", 0)
+        d["_task_count"] = doc_counts.get("task", 0)
+        d["_note_count"] = doc_counts.get("note", 0)
+    return docs
+
+
 @frappe.whitelist(allow_guest=True)
 def get_linked_docs_of_document(doctype, docname):
     doc = frappe.get_doc(doctype, docname)
@@ -1037,21 +1383,35 @@ def get_linked_docs_of_document(doctype, docname):
     dynamic_linked_docs = get_dynamic_linked_docs(doc)
 
     linked_docs.extend(dynamic_linked_docs)
-    linked_docs = list({doc["reference_docname"]: doc for doc in linked_docs}.values())
+    # same docname can exist in different doctypes, dedupe on the pair
+    linked_docs = list(
+        {(doc["reference_doctype"], doc["reference_docname"]): doc for doc in linked_docs}.values()
+    )
+
+    # one get_all per linked doctype for the few fields the title needs, not a get_doc per link
+    names_by_doctype = defaultdict(list)
+    for doc in linked_docs:
+        names_by_doctype[doc["reference_doctype"]].append(doc["reference_docname"])
+
+    linked_values = {}
+    for dt, names in names_by_doctype.items():
+        meta = frappe.get_meta(dt)
+        fields = ["name"] + [f for f in ("title", "from", "to", "organization") if meta.has_field(f)]
+        for row in frappe.get_all(dt, filters={"name": ["in", names]}, fields=fields):
+            linked_values[(dt, row.name)] = row
 
     docs_data = []
     for doc in linked_docs:
-        data = frappe.get_doc(doc["reference_doctype"], doc["reference_docname"])
-        title = data.get("title")
-        if data.doctype == "CRM Call Log":
-            title = f"Call from {data.get('from')} to {data.get('to')}"
+        data = linked_values.get((doc["reference_doctype"], doc["reference_docname"]))
+        if not data:
+            continue
 
-        if data.doctype == "CRM Deal":
-            title = data.get("organization")
+        get_title = LINKED_DOC_TITLES.get(doc["reference_doctype"], _default_linked_doc_title)
+        title = get_title(data)
 
         docs_data.append(
             {
-                "doc": data.doctype,
+                "doc": doc["reference_doctype"],
                 "title": title or data.get("name"),
                 "reference_docname": doc["reference_docname"],
                 "reference_doctype": doc["reference_doctype"],
@@ -1060,32 +1420,51 @@ def get_linked_docs_of_document(doctype, docname):
     return docs_data
 
 
+def _default_linked_doc_title(data):
+    return data.get("title")
+
+
+# how get_linked_docs_of_document titles a linked doc, by doctype (falls back to its name)
+LINKED_DOC_TITLES = {
+    "CRM Call Log": lambda data: f"Call from {data.get('from')} to {data.get('to')}",
+    "CRM Deal": lambda data: data.get("organization"),
+}
+
+
 def remove_doc_link(doctype, docname):
-    linked_doc_data = frappe.get_doc(doctype, docname)
-    linked_doc_data.update(
-        {
-            "reference_doctype": None,
-            "reference_docname": None,
-        }
-    )
-    linked_doc_data.save(ignore_permissions=True)
+    remove_doc_links(doctype, [docname])
+
+
+def remove_doc_links(doctype, docnames):
+    # a direct UPDATE of the link columns instead of loading and re-saving every document
+    meta = frappe.get_meta(doctype)
+    values = {f: None for f in ("reference_doctype", "reference_docname") if meta.has_field(f)}
+    if values and docnames:
+        frappe.db.set_value(doctype, {"name": ["in", list(docnames)]}, values)
 
 
 def remove_contact_link(doctype, docname):
-    linked_doc_data = frappe.get_doc(doctype, docname)
-    linked_doc_data.update(
-        {
-            "contact": None,
-            "contacts": [],
-        }
-    )
-    linked_doc_data.save(ignore_permissions=True)
+    remove_contact_links(doctype, [docname])
+
+
+def remove_contact_links(doctype, docnames):
+    if not docnames:
+        return
+
+    meta = frappe.get_meta(doctype)
+    if meta.has_field("contact"):
+        frappe.db.set_value(doctype, {"name": ["in", list(docnames)]}, "contact", None)
+
+    if contacts_field := meta.get_field("contacts"):
+        frappe.db.delete(
+            contacts_field.options,
+            {"parent": ["in", list(docnames)], "parenttype": doctype, "parentfield": "contacts"},
+        )
 
 
 @frappe.whitelist(allow_guest=True)
 def remove_linked_doc_reference(items, remove_contact=None, delete=False):
-    if isinstance(items, str):
-        items = frappe.parse_json(items)
+    items = json_loads(items)
 
     for item in items:
         if remove_contact:
@@ -1103,23 +1482,37 @@ def remove_linked_doc_reference(items, remove_contact=None, delete=False):
 def delete_bulk_docs(doctype, items, delete_linked=False):
     from frappe.desk.reportview import delete_bulk
 
-    items = frappe.parse_json(items)
-    for doc in items:
-        linked_docs = get_linked_docs_of_document(doctype, doc)
-        for linked_doc in linked_docs:
-            remove_linked_doc_reference(
-                [
-                    {
-                        "doctype": linked_doc["reference_doctype"],
-                        "docname": linked_doc["reference_docname"],
-                    }
-                ],
-                remove_contact=doctype == "Contact",
-                delete=delete_linked,
-            )
+    items = _coerce_str_list(items)
+
+    # linked docs of every item, grouped by doctype so each group is unlinked in one UPDATE
+    # found with one IN (...) query per link field across all items
+    linked_by_doctype = defaultdict(dict)
+    for linked_doc in get_bulk_linked_docs(doctype, items) + get_bulk_dynamic_linked_docs(doctype, items):
+        # single doctype links carry no reference_doctype, there is nothing to unlink
+        if linked_doc.get("reference_doctype"):
+            linked_by_doctype[linked_doc["reference_doctype"]][linked_doc["reference_docname"]] = None
+
+    for linked_doctype, linked_names in linked_by_doctype.items():
+        linked_names = list(linked_names)
+        if doctype == "Contact":
+            remove_contact_links(linked_doctype, linked_names)
+        else:
+            remove_doc_links(linked_doctype, linked_names)
+
+        if delete_linked:
+            for linked_name in linked_names:
+                frappe.delete_doc(linked_doctype, linked_name)
 
     if len(items) > 10:
-        frappe.enqueue("frappe.desk.reportview.delete_bulk", doctype=doctype, items=items)
+        # bounded jobs instead of one job holding the whole list, queued once this request commits
+        for i in range(0, len(items), DELETE_BULK_CHUNK_SIZE):
+            frappe.enqueue(
+                "frappe.desk.reportview.delete_bulk",
+                queue="long",
+                enqueue_after_commit=True,
+                doctype=doctype,
+                items=items[i : i + DELETE_BULK_CHUNK_SIZE],
+            )
     else:
         delete_bulk(doctype, items)
     return "success"
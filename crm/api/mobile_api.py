@@ -8,9 +8,60 @@ The `get_oauth_config` endpoint allows guest access for retrieving site-specific
 
 import frappe
 import os
+import re
 from frappe import _
+from frappe.model import no_value_fields
 from frappe.utils import today, getdate, nowdate, cint, strip_html, add_days
-from frappe.desk.form.assign_to import add as assign_task, remove as unassign_task
+
+from crm.utils import json_loads
+
+
+DOCTYPE_FIELDNAMES_CACHE_KEY = "crm_mobile_doctype_fieldnames"
+DOCTYPE_LINK_FIELDS_CACHE_KEY = "crm_mobile_doctype_link_fields"
+LINK_SEARCH_FIELDS_CACHE_KEY = "crm_mobile_link_search_fields"
+STANDARD_QUERY_FIELDS = frozenset({"name", "modified"})
+OAUTH_CONFIG_CACHE_KEY = "crm_mobile_oauth_config"
+OAUTH_CONFIG_CACHE_TTL = 240
+OAUTH_ALLOWED_DOMAINS_CACHE_KEY = "crm_mobile_oauth_allowed_domains"
+OAUTH_ALLOWED_DOMAINS_CACHE_TTL = 300
+
+
+def _doctype_fieldnames(dt):
+	"""
+	Fieldnames of `dt` (plus name/modified), cached in redis across requests so the
+	mobile endpoints don't rebuild the set from the meta on every call.
+	Cleared by clear_doctype_fieldnames_cache when the DocType or its Custom Fields change.
+	"""
+
+	def load():
+		have = {f.fieldname for f in frappe.get_meta(dt).fields}
+		# standard meta fields we may use:
+		have |= STANDARD_QUERY_FIELDS
+		return have
+
+	return frappe.cache().hget(DOCTYPE_FIELDNAMES_CACHE_KEY, dt, generator=load)
+
+
+def _doctype_docfield_names(dt):
+	"""Fieldnames of the DocFields of `dt` (the fields a client may set), from the same cache."""
+	return _doctype_fieldnames(dt) - STANDARD_QUERY_FIELDS
+
+
+def _doctype_link_fields(dt):
+	"""{fieldname: linked doctype} for the Link fields of `dt`, cached like _doctype_fieldnames."""
+
+	def load():
+		return {f.fieldname: f.options for f in frappe.get_meta(dt).fields if f.fieldtype == "Link" and f.options}
+
+	return frappe.cache().hget(DOCTYPE_LINK_FIELDS_CACHE_KEY, dt, generator=load)
+
+
+def clear_doctype_fieldnames_cache(doc, method=None):
+	"""Doc-event hook (DocType / Custom Field)."""
+	dt = doc.get("dt") if doc.doctype == "Custom Field" else doc.get("name")
+	if dt:
+		for key in (DOCTYPE_FIELDNAMES_CACHE_KEY, DOCTYPE_LINK_FIELDS_CACHE_KEY, LINK_SEARCH_FIELDS_CACHE_KEY):
+			frappe.cache().hdel(key, dt)
 
 
 def _safe_fields(dt, want):
@@ -18,83 +69,98 @@ def _safe_fields(dt, want):
 	Return only fields that exist on the given doctype.
 	Prevents KeyErrors when querying fields that don't exist.
 	"""
-	meta = frappe.get_meta(dt)
-	have = {f.fieldname for f in meta.fields}
-	# standard meta fields we may use:
-	have |= {"name", "modified"}
+	have = _doctype_fieldnames(dt)
 	return [f for f in want if f in have]
 
 
-def _get_assigned_users(doctype, docname):
+def _get_user_details(users):
+	"""
+	{user: email, display name and profile picture} of the given users in one query.
+	Users that don't exist are skipped.
+	"""
+	if not users:
+		return {}
+	rows = frappe.get_all(
+		"User",
+		filters={"name": ["in", list(users)]},
+		fields=["name", "email", "full_name", "user_image"],
+	)
+	return {
+		row.name: {
+			"email": row.email or row.name,
+			"name": row.full_name or row.name,
+			"profile_pic": row.user_image or None,
+		}
+		for row in rows
+	}
+
+
+def _get_assigned_users_bulk(doctype, docnames):
 	"""
-	Get all assigned users for a document with full user details.
+	Assigned users of many documents with full user details, in one ToDo/User join.
 	
 	Args:
 		doctype: Document type (e.g., "CRM Task")
-		docname: Document name/ID
+		docnames: Document names/IDs
 		
 	Returns:
-		List of user objects with email, name, and profile_pic
+		{docname: list of user objects with email, name, and profile_pic}; documents
+		without open assignments are missing (or fall back to their assigned_to field)
 	"""
-	assigned_users = []
-	
-	# Return empty list if docname is None or empty
-	if not docname:
-		return assigned_users
-	
-	# Get assigned users from ToDo table (Frappe's assign_to system)
-	todos = frappe.get_all(
-		"ToDo",
-		filters={
-			"reference_type": doctype,
-			"reference_name": docname,
-			"status": "Open"
-		},
-		fields=["allocated_to"],
-		distinct=True
+	docnames = list({name for name in docnames if name})
+	if not docnames:
+		return {}
+	
+	# Get assigned users from ToDo table (Frappe's assign_to system), joined with User
+	# so the user details come back in the same query
+	ToDo = frappe.qb.DocType("ToDo")
+	User = frappe.qb.DocType("User")
+	rows = (
+		frappe.qb.from_(ToDo)
+		.left_join(User)
+		.on(User.name == ToDo.allocated_to)
+		.select(ToDo.reference_name, User.name.as_("user"), User.email, User.full_name, User.user_image)
+		.distinct()
+		.where(ToDo.reference_type == doctype)
+		.where(ToDo.reference_name.isin(docnames))
+		.where(ToDo.status == "Open")
+		.where(ToDo.allocated_to.isnotnull())
+		.where(ToDo.allocated_to != "")
+		.run(as_dict=True)
 	)
 	
-	# Collect unique user emails
-	user_emails = set()
-	for todo in todos:
-		if todo.get("allocated_to"):
-			user_emails.add(todo.get("allocated_to"))
+	assigned_users = {}
+	for row in rows:
+		# Users that no longer exist are skipped
+		if not row.user:
+			continue
+		assigned_users.setdefault(row.reference_name, []).append(
+			{
+				"email": row.email or row.user,
+				"name": row.full_name or row.user,
+				"profile_pic": row.user_image or None,
+			}
+		)
 	
 	# If no users found in ToDo, check the assigned_to field directly
-	# Only if docname is not None
-	if not user_emails and docname:
+	unassigned = [name for name in docnames if name not in assigned_users]
+	if unassigned and "assigned_to" in _doctype_fieldnames(doctype):
 		try:
-			task_doc = frappe.get_doc(doctype, docname)
-			if hasattr(task_doc, "assigned_to") and task_doc.assigned_to:
-				user_emails.add(task_doc.assigned_to)
-		except Exception:
-			# If document doesn't exist or error occurs, skip
-			pass
-	
-	# Get user details for each assigned user
-	for email in user_emails:
-		try:
-			user = frappe.get_doc("User", email)
-			user_data = {
-				"email": user.email or email,
-				"name": user.full_name or user.name,
+			fallback = {
+				row.name: row.assigned_to
+				for row in frappe.get_all(
+					doctype,
+					filters={"name": ["in", unassigned], "assigned_to": ["is", "set"]},
+					fields=["name", "assigned_to"],
+				)
 			}
-			
-			# Get profile picture if available
-			if hasattr(user, "user_image") and user.user_image:
-				user_data["profile_pic"] = user.user_image
-			elif hasattr(user, "photo") and user.photo:
-				user_data["profile_pic"] = user.photo
-			else:
-				user_data["profile_pic"] = None
-			
-			assigned_users.append(user_data)
-		except frappe.DoesNotExistError:
-			# User doesn't exist, skip
-			continue
+			users = _get_user_details(set(fallback.values()))
+			for name, assigned_to in fallback.items():
+				if assigned_to in users:
+					assigned_users[name] = [users[assigned_to]]
 		except Exception:
-			# Error fetching user, skip
-			continue
+			# If an error occurs, skip the fallback
+			pass
 	
 	return assigned_users
 
@@ -112,6 +178,8 @@ def _ensure_user_from_mobile_data(email=None, name=None, profile_pic=None, user_
 	
 	Returns:
 		User email (for use in assignments)
+	
+	Does not commit: the calling endpoint commits once, after all its writes.
 	"""
 	if not email:
 		return None
@@ -137,7 +205,6 @@ def _ensure_user_from_mobile_data(email=None, name=None, profile_pic=None, user_
 		
 		if updated:
 			user.save(ignore_permissions=True)
-			frappe.db.commit()
 		
 		return email
 	else:
@@ -157,7 +224,6 @@ def _ensure_user_from_mobile_data(email=None, name=None, profile_pic=None, user_
 					user.photo = profile_pic
 			
 			user.insert(ignore_permissions=True)
-			frappe.db.commit()
 			return email
 		except Exception as e:
 			frappe.log_error(f"Failed to create user {email}: {str(e)}", "User Creation Error")
@@ -165,9 +231,68 @@ def _ensure_user_from_mobile_data(email=None, name=None, profile_pic=None, user_
 			return email
 
 
-def get_compact_task(task, return_all_fields=False):
+def _ensure_users_from_mobile_data_bulk(users):
 	"""
-	Return task representation.
+	Bulk variant of _ensure_user_from_mobile_data for a list of mobile user objects
+	({"email"/"id", "name", "profile_pic"}) and/or plain email strings.
+	
+	Existing users are read with one query and only saved when their name or picture
+	changed; missing users are created one by one (User.insert runs the role and
+	settings hooks, so they can't be bulk inserted). Email strings are passed through.
+	
+	Returns:
+		User emails in input order (entries without an email are dropped)
+	"""
+	wanted = {
+		user.get("email") or user.get("id")
+		for user in users
+		if isinstance(user, dict) and (user.get("email") or user.get("id"))
+	}
+	existing = {}
+	if wanted:
+		fields = _safe_fields("User", ["name", "full_name", "user_image"])
+		existing = {
+			row.name: row for row in frappe.get_all("User", filters={"name": ["in", list(wanted)]}, fields=fields)
+		}
+	
+	emails = []
+	for user in users:
+		if isinstance(user, str):
+			if user:
+				emails.append(user)
+			continue
+		if not isinstance(user, dict):
+			continue
+		email = user.get("email") or user.get("id")
+		if not email:
+			continue
+		row = existing.get(email)
+		name, profile_pic = user.get("name"), user.get("profile_pic")
+		if (
+			row is None
+			or (name and name != row.get("full_name"))
+			or (profile_pic and profile_pic != row.get("user_image"))
+		):
+			email = _ensure_user_from_mobile_data(
+				email=email, name=name, profile_pic=profile_pic, user_id=user.get("id")
+			)
+			# Later duplicates of the same user are already up to date
+			existing[email] = frappe._dict(full_name=name, user_image=profile_pic)
+		if email:
+			emails.append(email)
+	return emails
+
+
+def _plain_description(description):
+	"""Description without HTML tags; plain-text descriptions (the usual mobile case) skip strip_html."""
+	if "<" not in description:
+		return description.strip()
+	return strip_html(description).strip()
+
+
+def _compact_task_fields(task, return_all_fields=False):
+	"""
+	Task representation without link expansion (see get_compact_tasks).
 	Accepts both Document objects and dict-like objects (frappe._dict).
 	
 	Args:
@@ -194,7 +319,7 @@ def get_compact_task(task, return_all_fields=False):
 					result[key] = value
 			# Clean HTML from description field if it exists
 			if 'description' in result and result['description']:
-				result['description'] = strip_html(result['description']).strip()
+				result['description'] = _plain_description(result['description'])
 		else:
 			# Document object - get all fields from meta
 			for field in task.meta.fields:
@@ -225,7 +350,7 @@ def get_compact_task(task, return_all_fields=False):
 			
 			# Clean HTML from description field if it exists
 			if 'description' in result and result['description']:
-				result['description'] = strip_html(result['description']).strip()
+				result['description'] = _plain_description(result['description'])
 	else:
 		# Compact mode - return only core fields
 		result = {
@@ -242,90 +367,174 @@ def get_compact_task(task, return_all_fields=False):
 		if due_date is not None:
 			result["due_date"] = due_date
 	
-	# Get assigned users with full details (always override assigned_to field)
-	try:
-		assigned_users = _get_assigned_users("CRM Task", task_name)
-		if assigned_users:
-			result["assigned_to"] = assigned_users
-		else:
-			# Fallback: check if assigned_to field exists (single user)
-			assigned_to = _get(task, "assigned_to")
-			if assigned_to:
-				# Try to get user details for single assigned user
-				try:
-					user = frappe.get_doc("User", assigned_to)
-					result["assigned_to"] = [{
-						"email": user.email or assigned_to,
-						"name": user.full_name or user.name,
-						"profile_pic": getattr(user, "user_image", None) or getattr(user, "photo", None) or None
-					}]
-				except Exception:
-					# If user doesn't exist or error, return empty array
-					result["assigned_to"] = []
-			else:
-				result["assigned_to"] = []
-	except Exception:
-		# Error getting assigned users, return empty array
-		result["assigned_to"] = []
-	
-	# Expand link fields to return names instead of IDs
-	# Lead field - return lead_name instead of ID
-	lead_id = _get(result, "lead")
-	if lead_id:
-		try:
-			lead_doc = frappe.get_doc("CRM Lead", lead_id)
-			lead_name = lead_doc.get("lead_name") or lead_doc.get("organization") or lead_doc.get("email") or lead_id
-			result["lead"] = lead_name
-			result["lead_id"] = lead_id
-		except Exception:
-			result["lead_id"] = lead_id
-	
-	# Reference DocName (Lead) - return lead name
-	reference_docname = _get(result, "reference_docname")
-	reference_doctype = _get(result, "reference_doctype")
-	if reference_docname and reference_doctype == "CRM Lead":
+	return result
+
+
+# Link fields on CRM Task that are expanded to a display name, with the fields read from the
+# linked doctype (the first non-empty one wins, falling back to the ID)
+TASK_LINK_EXPANSIONS = {
+	"lead": ("CRM Lead", ("lead_name", "organization", "email")),
+	"project": ("Real Estate Project", ("project_name",)),
+	"unit": ("Unit", ("unit_name", "name")),
+	"project_unit": ("Project Unit", ("unit_name", "name")),
+}
+
+# Same for CRM Lead
+LEAD_LINK_EXPANSIONS = {
+	"status": ("CRM Lead Status", ("lead_status",)),
+	"source": ("CRM Lead Source", ("source_name",)),
+	"industry": ("CRM Industry", ("industry_name",)),
+	"lead_owner": ("User", ("full_name", "name")),
+	"project": ("Real Estate Project", ("project_name",)),
+	"project_unit": ("Project Unit", ("unit_name", "name")),
+	"single_unit": ("Unit", ("unit_name", "name")),
+}
+
+
+def _get_link_titles(doctype, names, title_fields):
+	"""
+	{name: display name} for `names` of `doctype` in one query; names that don't exist (or a
+	doctype that isn't installed) are simply missing from the result.
+	"""
+	if not names:
+		return {}
+	if len(names) == 1:
+		# Single-document endpoints: read from the document cache, which Frappe clears
+		# whenever the linked document is saved or deleted
+		name = next(iter(names))
 		try:
-			lead_doc = frappe.get_doc("CRM Lead", reference_docname)
-			lead_name = lead_doc.get("lead_name") or lead_doc.get("organization") or lead_doc.get("email") or reference_docname
-			result["reference_docname"] = lead_name
-			result["reference_docname_id"] = reference_docname
+			row = frappe.get_cached_value(doctype, name, list(title_fields), as_dict=True)
 		except Exception:
+			return {}
+		if not row:
+			return {}
+		return {name: next((row.get(f) for f in title_fields if row.get(f)), None) or name}
+	try:
+		fields = _safe_fields(doctype, ["name", *title_fields])
+		rows = frappe.get_all(doctype, filters={"name": ["in", list(names)]}, fields=fields)
+	except Exception:
+		return {}
+	return {
+		row.name: next((row.get(f) for f in title_fields if row.get(f)), None) or row.name for row in rows
+	}
+
+
+def _expand_links(results, expansions, extra_names=None):
+	"""
+	Replace link IDs in serialized rows with display names (keeping the ID in `<field>_id`),
+	one query per linked doctype. Returns the fetched titles, keyed by doctype.
+	"""
+	wanted = {doctype: set(names) for doctype, names in (extra_names or {}).items()}
+	for fieldname, (doctype, _fields) in expansions.items():
+		wanted.setdefault(doctype, set()).update(r.get(fieldname) for r in results if r.get(fieldname))
+
+	titles = {
+		doctype: _get_link_titles(doctype, wanted[doctype], title_fields)
+		for doctype, title_fields in expansions.values()
+	}
+
+	for result in results:
+		for fieldname, (doctype, _fields) in expansions.items():
+			link_id = result.get(fieldname)
+			if not link_id:
+				continue
+			if link_id in titles[doctype]:
+				result[fieldname] = titles[doctype][link_id]
+			result[f"{fieldname}_id"] = link_id
+
+	return titles
+
+
+def _expand_task_links(results):
+	"""Replace link IDs in serialized tasks with display names, one query per linked doctype."""
+	# CRM Lead ids are shared by the lead field and reference_docname of lead-linked tasks
+	lead_references = {
+		r.get("reference_docname")
+		for r in results
+		if r.get("reference_docname") and r.get("reference_doctype") == "CRM Lead"
+	}
+	titles = _expand_links(results, TASK_LINK_EXPANSIONS, {"CRM Lead": lead_references})
+
+	for result in results:
+		# Reference DocName (Lead) - return lead name
+		reference_docname = result.get("reference_docname")
+		if reference_docname and result.get("reference_doctype") == "CRM Lead":
+			if reference_docname in titles["CRM Lead"]:
+				result["reference_docname"] = titles["CRM Lead"][reference_docname]
 			result["reference_docname_id"] = reference_docname
+
+	return results
+
+
+def _attach_assignees(doctype, results):
+	"""Set `assigned_to` (always overriding the field value) on serialized rows, in one query."""
+	try:
+		assigned_users = _get_assigned_users_bulk(doctype, [r.get("name") for r in results])
+	except Exception:
+		# Error getting assigned users, return empty arrays
+		assigned_users = {}
+	for result in results:
+		result["assigned_to"] = assigned_users.get(result.get("name"), [])
+	return results
+
+
+def get_compact_tasks(tasks, return_all_fields=False):
+	"""
+	Serialize many tasks at once; linked lead/project/unit names are fetched with one
+	query per linked doctype instead of a get_doc per task and link.
+	"""
+	results = [_compact_task_fields(task, return_all_fields) for task in tasks]
+	# The compact representation carries no link fields, so there is nothing to expand
+	if return_all_fields:
+		_expand_task_links(results)
+	_attach_assignees("CRM Task", results)
+	return results
+
+
+def get_compact_task(task, return_all_fields=False):
+	"""
+	Return task representation.
+	Accepts both Document objects and dict-like objects (frappe._dict).
 	
-	# Project field - return project_name instead of ID
-	project_id = _get(result, "project")
-	if project_id:
-		try:
-			project_doc = frappe.get_doc("Real Estate Project", project_id)
-			project_name = project_doc.get("project_name") or project_id
-			result["project"] = project_name
-			result["project_id"] = project_id
-		except Exception:
-			result["project_id"] = project_id
-	
-	# Unit field - return unit_name instead of ID
-	unit_id = _get(result, "unit")
-	if unit_id:
-		try:
-			unit_doc = frappe.get_doc("Unit", unit_id)
-			unit_name = unit_doc.get("unit_name") or unit_doc.get("name") or unit_id
-			result["unit"] = unit_name
-			result["unit_id"] = unit_id
-		except Exception:
-			result["unit_id"] = unit_id
-	
-	# Project Unit field - return unit_name instead of ID
-	project_unit_id = _get(result, "project_unit")
-	if project_unit_id:
-		try:
-			project_unit_doc = frappe.get_doc("Project Unit", project_unit_id)
-			project_unit_name = project_unit_doc.get("unit_name") or project_unit_doc.get("name") or project_unit_id
-			result["project_unit"] = project_unit_name
-			result["project_unit_id"] = project_unit_id
-		except Exception:
-			result["project_unit_id"] = project_unit_id
-	
-	return result
+	Args:
+		task: Task document or dict
+		return_all_fields: If True, return all available fields from task object
+	"""
+	return get_compact_tasks([task], return_all_fields)[0]
+
+
+def _configured_domains():
+	"""
+	Normalized `domains` and `host_name` from the current site's site_config, as a set.
+	Cached for OAUTH_ALLOWED_DOMAINS_CACHE_TTL seconds so guest OAuth requests don't
+	rebuild the list on every call.
+	"""
+	cached = frappe.cache().get_value(OAUTH_ALLOWED_DOMAINS_CACHE_KEY)
+	if cached is not None:
+		return set(cached)
+	
+	# frappe.conf is the site config Frappe already loaded for this request, so a cache
+	# miss doesn't re-read site_config.json either
+	site_config = frappe.conf
+	allowed_domains = set()
+	
+	# Get domains list if available
+	if "domains" in site_config and site_config["domains"]:
+		if isinstance(site_config["domains"], list):
+			allowed_domains.update(d.lower().strip() for d in site_config["domains"])
+		elif isinstance(site_config["domains"], str):
+			# Comma-separated or space-separated
+			domains_str = site_config["domains"]
+			allowed_domains.update(d.lower().strip() for d in domains_str.replace(",", " ").split())
+	
+	# Get host_name if available
+	if "host_name" in site_config and site_config["host_name"]:
+		allowed_domains.add(site_config["host_name"].lower().strip())
+	
+	frappe.cache().set_value(
+		OAUTH_ALLOWED_DOMAINS_CACHE_KEY, sorted(allowed_domains), expires_in_sec=OAUTH_ALLOWED_DOMAINS_CACHE_TTL
+	)
+	return allowed_domains
 
 
 def _validate_host():
@@ -335,7 +544,7 @@ def _validate_host():
 	This prevents returning client_id for external domains that don't belong to the site.
 	
 	Returns:
-		None (raises ValidationError if host is not allowed)
+		The validated, normalized host (raises ValidationError if host is not allowed)
 	
 	Raises:
 		frappe.exceptions.ValidationError: If host is not in site's allowed domains
@@ -386,24 +595,9 @@ def _validate_host():
 		))
 	
 	# Get allowed domains from site config
-	allowed_domains = []
+	allowed_domains = set()
 	try:
-		site_config = frappe.get_site_config()
-		
-		# Get domains list if available
-		if "domains" in site_config and site_config["domains"]:
-			if isinstance(site_config["domains"], list):
-				allowed_domains.extend([d.lower().strip() for d in site_config["domains"]])
-			elif isinstance(site_config["domains"], str):
-				# Comma-separated or space-separated
-				domains_str = site_config["domains"]
-				allowed_domains.extend([d.lower().strip() for d in domains_str.replace(",", " ").split()])
-		
-		# Get host_name if available
-		if "host_name" in site_config and site_config["host_name"]:
-			host_name = site_config["host_name"].lower().strip()
-			if host_name not in allowed_domains:
-				allowed_domains.append(host_name)
+		allowed_domains = _configured_domains()
 		
 		# SECURITY: If no domains configured, use site_name ONLY if it matches host
 		# This is a minimal fallback for sites without explicit domain config
@@ -412,7 +606,7 @@ def _validate_host():
 			site_name_lower = site_name.lower().strip()
 			# Only allow if host exactly matches site_name (exact match required)
 			if host == site_name_lower:
-				allowed_domains.append(site_name_lower)
+				allowed_domains.add(site_name_lower)
 			else:
 				# Host doesn't match site_name and no domains configured - DENY
 				frappe.log_error(
@@ -428,7 +622,7 @@ def _validate_host():
 		site_name_lower = site_name.lower().strip() if site_name else None
 		if site_name_lower and host == site_name_lower:
 			# Exact match - allow as minimal fallback
-			allowed_domains = [site_name_lower]
+			allowed_domains = {site_name_lower}
 		else:
 			# No match or no site_name - DENY
 			frappe.log_error(
@@ -461,6 +655,8 @@ def _validate_host():
 			"Access denied: The domain '{host}' is not configured for this site. "
 			"Please use a valid domain for site '{site_name}'."
 		).format(host=host, site_name=site_name))
+	
+	return host
 
 
 def _ensure_mobile_oauth_settings():
@@ -474,7 +670,19 @@ def _ensure_mobile_oauth_settings():
 	
 	Returns:
 		Mobile OAuth Settings document
+	
+	Commits once, after the OAuth Client and settings are both written: get_oauth_config
+	is usually called with GET, and those requests are not committed by Frappe.
 	"""
+	# Fast path: settings already configured. Served from the document cache, without the
+	# site/database checks below, which only matter before an OAuth Client is created
+	try:
+		cached_settings = frappe.get_cached_doc("Mobile OAuth Settings")
+	except Exception:
+		cached_settings = None
+	if cached_settings and cached_settings.client_id:
+		return cached_settings
+	
 	# Validate that the current site exists in Frappe bench
 	# This prevents creating OAuth clients for non-existent sites (e.g., facebook.com)
 	site_name = frappe.local.site if frappe.local else None
@@ -554,7 +762,6 @@ def _ensure_mobile_oauth_settings():
 			"name": "Mobile OAuth Settings"
 		})
 		settings.insert(ignore_permissions=True)
-		frappe.db.commit()
 	
 	# If client_id is already set, return settings
 	if settings.client_id:
@@ -603,7 +810,6 @@ def _ensure_mobile_oauth_settings():
 	
 	# Insert the OAuth Client (client_id and client_secret are auto-generated)
 	client_doc.insert(ignore_permissions=True)
-	frappe.db.commit()
 	
 	# Update Mobile OAuth Settings with the OAuth Client info
 	settings.client_id = client_doc.client_id
@@ -640,7 +846,14 @@ def get_oauth_config():
 	"""
 	# Step 1: Validate Host header (deny by default if not in allowed domains)
 	# This MUST be the first check - no client_id should be returned if host is invalid
-	_validate_host()
+	host = _validate_host()
+	
+	# The configuration only changes when Mobile OAuth Settings are saved, serve it from
+	# cache (per validated host) for a few minutes
+	cache_key = f"{OAUTH_CONFIG_CACHE_KEY}:{host}"
+	cached_config = frappe.cache().get_value(cache_key)
+	if cached_config:
+		return cached_config
 	
 	# Step 2: Ensure OAuth settings exist and are configured
 	# This will create OAuth Client automatically if needed (idempotent)
@@ -667,11 +880,19 @@ def get_oauth_config():
 		)
 		frappe.throw(_("OAuth configuration is incomplete. Please contact system administrator."))
 	
-	return {
+	config = {
 		"client_id": settings.client_id,
 		"scope": settings.scope or "all openid",
 		"redirect_uri": settings.redirect_uri or "app.trust://oauth2redirect"
 	}
+	frappe.cache().set_value(cache_key, config, expires_in_sec=OAUTH_CONFIG_CACHE_TTL)
+	return config
+
+
+def clear_oauth_config_cache():
+	"""Drop the cached get_oauth_config responses of every host, and the allowed domains."""
+	frappe.cache().delete_keys(OAUTH_CONFIG_CACHE_KEY)
+	frappe.cache().delete_value(OAUTH_ALLOWED_DOMAINS_CACHE_KEY)
 
 
 @frappe.whitelist(allow_guest=True)
@@ -732,6 +953,106 @@ def test_host_validation(test_host=None, expected_result=None):
 			frappe.local.request = original_request
 
 
+# Name-like fields a link value may be given as instead of the ID, in lookup order
+# (followed by the linked doctype's other Data fields)
+LINK_NAME_FIELDS = ("title", "full_name", "lead_name", "unit_name", "project_name")
+
+
+def _link_search_fields(doctype):
+	def load():
+		meta = frappe.get_meta(doctype)
+		fields = [f for f in LINK_NAME_FIELDS if meta.has_field(f)]
+		fields += [f.fieldname for f in meta.fields if f.fieldtype == "Data" and f.fieldname not in fields]
+		return fields
+
+	return frappe.cache().hget(LINK_SEARCH_FIELDS_CACHE_KEY, doctype, generator=load)
+
+
+def _resolve_link_value(doctype, value, search_fields=None):
+	"""
+	ID of the `doctype` record whose name, or one of `search_fields` (default: the
+	_link_search_fields of the doctype), equals `value`, in a single query. An exact ID
+	match wins, then the fields in order. Returns None if nothing matches.
+	"""
+	if search_fields is None:
+		search_fields = _link_search_fields(doctype)
+	else:
+		have = _doctype_fieldnames(doctype)
+		search_fields = [f for f in search_fields if f in have]
+	# One branch per field rather than an OR across them, so the ID branch is a primary key
+	# lookup, indexed fields can use their index and each branch stops at its first match
+	branches = " union all ".join(
+		f"(select name, {i} as link_rank from `tab{doctype}` where `{f}` = %(value)s limit 1)"
+		for i, f in enumerate(["name", *search_fields])
+	)
+	rows = frappe.db.sql(f"{branches} order by link_rank limit 1", {"value": value})
+	return rows[0][0] if rows else None
+
+
+def _resolve_link_values(values, link_fields):
+	"""
+	Batch form of _resolve_link_value for the link fields among `values` ({fieldname: value},
+	`link_fields` as returned by _doctype_link_fields): {fieldname: ID} for the values that
+	match. Values that are IDs are found with one query per linked doctype; only the rest
+	are probed against the name-like fields.
+	"""
+	pending = {}
+	for fieldname, value in values.items():
+		if fieldname in link_fields and isinstance(value, str) and value:
+			pending.setdefault(link_fields[fieldname], set()).add(value)
+	
+	resolved = {}
+	for doctype, doctype_values in pending.items():
+		try:
+			ids = set(frappe.get_all(doctype, filters={"name": ["in", list(doctype_values)]}, pluck="name"))
+		except Exception:
+			# If any error occurs (e.g. the doctype isn't installed), skip its fields
+			continue
+		matches = resolved.setdefault(doctype, {value: value for value in doctype_values & ids})
+		for value in doctype_values - ids:
+			try:
+				link_name = _resolve_link_value(doctype, value)
+			except Exception:
+				link_name = None
+			if link_name:
+				matches[value] = link_name
+	
+	return {
+		fieldname: resolved[link_fields[fieldname]][value]
+		for fieldname, value in values.items()
+		if fieldname in link_fields
+		and isinstance(value, str)
+		and value in resolved.get(link_fields[fieldname], {})
+	}
+
+
+def _assign_task_users(task, users):
+	"""
+	Assign `task` to `users` with one assign_to call behind a savepoint. If one user fails
+	the whole call, it is rolled back and retried per user, so only that user is skipped.
+	"""
+	if not users:
+		return
+	
+	from frappe.desk.form.assign_to import add as assign_task
+	
+	assign_args = {
+		"doctype": "CRM Task",
+		"name": task.name,
+		"description": task.title or task.description or "",
+	}
+	frappe.db.savepoint("assign_task")
+	try:
+		assign_task({**assign_args, "assign_to": users})
+	except Exception:
+		frappe.db.rollback(save_point="assign_task")
+		for user_email in users:
+			try:
+				assign_task({**assign_args, "assign_to": [user_email]})
+			except Exception as e:
+				frappe.log_error(f"Failed to assign task {task.name} to {user_email}: {str(e)}", "Task Assignment Error")
+
+
 @frappe.whitelist()
 def create_task(title=None, status=None, priority=None, start_date=None, 
 				task_type=None, description=None, assigned_to=None, due_date=None,
@@ -772,8 +1093,7 @@ def create_task(title=None, status=None, priority=None, start_date=None,
 		start_date = today()
 	
 	# Get CRM Task meta to validate fields
-	task_meta = frappe.get_meta("CRM Task")
-	valid_fields = {f.fieldname for f in task_meta.fields}
+	valid_fields = _doctype_docfield_names("CRM Task")
 	
 	# Create task with all available fields
 	task_doc = {
@@ -802,87 +1122,43 @@ def create_task(title=None, status=None, priority=None, start_date=None,
 	
 	# Handle link fields that need validation/resolution
 	# Project Unit field - resolve name to ID if needed
+	# If not found (by ID or unit_name), don't set it to avoid LinkValidationError
 	project_unit = kwargs.get("project_unit")
 	if project_unit:
-		if frappe.db.exists("Project Unit", project_unit):
+		project_unit = _resolve_link_value("Project Unit", project_unit, ("unit_name",))
+		if project_unit:
 			task_doc["project_unit"] = project_unit
-		else:
-			# Try to find by unit_name
-			unit_doc = frappe.get_all("Project Unit", filters={"unit_name": project_unit}, fields=["name"], limit=1)
-			if unit_doc:
-				task_doc["project_unit"] = unit_doc[0].name
-			else:
-				# If not found, don't set it (or throw error if you want strict validation)
-				# For now, we'll skip it to avoid errors
-				pass
 	
 	# Unit field - resolve name to ID if needed
 	unit = kwargs.get("unit")
 	if unit:
-		if frappe.db.exists("Unit", unit):
+		unit = _resolve_link_value("Unit", unit, ("unit_name",))
+		if unit:
 			task_doc["unit"] = unit
-		else:
-			# Try to find by unit_name
-			unit_doc = frappe.get_all("Unit", filters={"unit_name": unit}, fields=["name"], limit=1)
-			if unit_doc:
-				task_doc["unit"] = unit_doc[0].name
-			else:
-				# If not found, don't set it
-				pass
 	
 	# Add any other valid fields from kwargs (excluding already handled fields)
 	excluded_fields = {"project_unit", "unit"}  # Fields we've already handled
 	
 	# Get field metadata for link field validation
-	link_fields = {}
-	for field in task_meta.fields:
-		if field.fieldtype == "Link" and field.options:
-			link_fields[field.fieldname] = field.options
+	link_fields = _doctype_link_fields("CRM Task")
 	
 	# Process remaining fields from kwargs
-	for key, value in kwargs.items():
-		if key in valid_fields and value is not None and key not in excluded_fields:
-			# If this is a link field, validate it exists
-			if key in link_fields:
-				link_doctype = link_fields[key]
-				# Check if value exists as ID
-				if frappe.db.exists(link_doctype, value):
-					task_doc[key] = value
-				else:
-					# Try to find by name field (common pattern)
-					# Most doctypes have a 'name' field that can be searched
-					try:
-						# Try common name fields
-						name_fields = ["name", "title", "full_name", "lead_name", "unit_name", "project_name"]
-						found = False
-						for name_field in name_fields:
-							if frappe.db.exists(link_doctype, {name_field: value}):
-								task_doc[key] = frappe.db.get_value(link_doctype, {name_field: value}, "name")
-								found = True
-								break
-						
-						# If not found, try get_all with filters
-						if not found:
-							# Get meta to find the main name field
-							link_meta = frappe.get_meta(link_doctype)
-							# Try to find by the first Data field that might be a name
-							for link_field in link_meta.fields:
-								if link_field.fieldtype == "Data" and link_field.fieldname not in ["name"]:
-									doc = frappe.get_all(link_doctype, filters={link_field.fieldname: value}, fields=["name"], limit=1)
-									if doc:
-										task_doc[key] = doc[0].name
-										found = True
-										break
-						
-						# If still not found, skip it to avoid LinkValidationError
-						if not found:
-							pass  # Skip invalid link field
-					except Exception:
-						# If any error occurs, skip this field
-						pass
-			else:
-				# Not a link field, add directly
-				task_doc[key] = value
+	updates = {
+		key: value
+		for key, value in kwargs.items()
+		if key in valid_fields and value is not None and key not in excluded_fields
+	}
+	resolved_links = _resolve_link_values(updates, link_fields)
+	for key, value in updates.items():
+		if key in link_fields:
+			# Accept the ID or a display name (title, lead_name, unit_name, ...);
+			# if nothing matches, skip it to avoid LinkValidationError
+			link_name = resolved_links.get(key)
+			if link_name:
+				task_doc[key] = link_name
+		else:
+			# Not a link field, add directly
+			task_doc[key] = value
 	
 	# Create task document
 	task = frappe.get_doc(task_doc)
@@ -891,82 +1167,40 @@ def create_task(title=None, status=None, priority=None, start_date=None,
 	if meeting_attendees is not None:
 		if isinstance(meeting_attendees, str):
 			try:
-				meeting_attendees = frappe.parse_json(meeting_attendees)
+				meeting_attendees = json_loads(meeting_attendees)
 			except:
 				meeting_attendees = []
 		
 		if isinstance(meeting_attendees, list):
 			task.meeting_attendees = []
-			for attendee in meeting_attendees:
-				if isinstance(attendee, dict):
-					# Extract email from attendee object
-					attendee_email = attendee.get("email") or attendee.get("id")
-					if attendee_email:
-						# Ensure user exists from mobile data
-						attendee_email = _ensure_user_from_mobile_data(
-							email=attendee_email,
-							name=attendee.get("name"),
-							profile_pic=attendee.get("profile_pic"),
-							user_id=attendee.get("id")
-						)
-						if attendee_email:
-							task.append("meeting_attendees", {
-								"crm_task_user": attendee_email
-							})
-				elif isinstance(attendee, str):
-					# Direct email string
-					if attendee:
-						task.append("meeting_attendees", {
-							"crm_task_user": attendee
-						})
+			# Attendee objects are matched to users in one query; email strings are used as-is
+			for attendee_email in _ensure_users_from_mobile_data_bulk(meeting_attendees):
+				task.append("meeting_attendees", {
+					"crm_task_user": attendee_email
+				})
 	
 	task.insert()
-	frappe.db.commit()
 	
 	# Handle assigned_to_list (multiple users via Frappe's assign_to system)
 	users_to_assign = []
 	if assigned_to_list is not None:
 		if isinstance(assigned_to_list, str):
 			try:
-				assigned_to_list = frappe.parse_json(assigned_to_list)
+				assigned_to_list = json_loads(assigned_to_list)
 			except:
 				assigned_to_list = [assigned_to_list]
 		
 		if isinstance(assigned_to_list, list):
-			for user_data in assigned_to_list:
-				if isinstance(user_data, dict):
-					# Extract email from user object
-					user_email = user_data.get("email") or user_data.get("id")
-					if user_email:
-						# Ensure user exists from mobile data
-						user_email = _ensure_user_from_mobile_data(
-							email=user_email,
-							name=user_data.get("name"),
-							profile_pic=user_data.get("profile_pic"),
-							user_id=user_data.get("id")
-						)
-						if user_email:
-							users_to_assign.append(user_email)
-				elif isinstance(user_data, str):
-					# Direct email string
-					if user_data:
-						users_to_assign.append(user_data)
+			# User objects are matched to users in one query; email strings are used as-is
+			users_to_assign.extend(_ensure_users_from_mobile_data_bulk(assigned_to_list))
 	
 	# Also add single assigned_to if provided
 	if assigned_to and assigned_to not in users_to_assign:
 		users_to_assign.append(assigned_to)
 	
-	# Assign task to all users
-	for user_email in users_to_assign:
-		try:
-			assign_task({
-				"doctype": "CRM Task",
-				"name": task.name,
-				"assign_to": [user_email],
-				"description": task.title or task.description or "",
-			})
-		except Exception as e:
-			frappe.log_error(f"Failed to assign task {task.name} to {user_email}: {str(e)}", "Task Assignment Error")
+	# Assign task to all users in one assign_to call; the task, its ToDos and any new
+	# users are committed together below
+	_assign_task_users(task, users_to_assign)
 	
 	frappe.db.commit()
 	
@@ -1014,8 +1248,7 @@ def edit_task(task_id=None, name=None, title=None, status=None, priority=None, s
 	task = frappe.get_doc("CRM Task", name)
 	
 	# Get CRM Task meta to validate fields
-	task_meta = frappe.get_meta("CRM Task")
-	valid_fields = {f.fieldname for f in task_meta.fields}
+	valid_fields = _doctype_docfield_names("CRM Task")
 	
 	# Update standard fields if provided
 	if title is not None:
@@ -1038,120 +1271,56 @@ def edit_task(task_id=None, name=None, title=None, status=None, priority=None, s
 		task.reference_docname = reference_docname
 	
 	# Get field metadata for link field validation
-	link_fields = {}
-	for field in task_meta.fields:
-		if field.fieldtype == "Link" and field.options:
-			link_fields[field.fieldname] = field.options
+	link_fields = _doctype_link_fields("CRM Task")
 	
 	# Update any other valid fields from kwargs
-	for key, value in kwargs.items():
-		if key in valid_fields and hasattr(task, key) and value is not None:
-			# If this is a link field, validate it exists
-			if key in link_fields:
-				link_doctype = link_fields[key]
-				# Check if value exists as ID
-				if frappe.db.exists(link_doctype, value):
-					setattr(task, key, value)
-				else:
-					# Try to find by name field (common pattern)
-					try:
-						# Try common name fields
-						name_fields = ["name", "title", "full_name", "lead_name", "unit_name", "project_name"]
-						found = False
-						for name_field in name_fields:
-							if frappe.db.exists(link_doctype, {name_field: value}):
-								link_id = frappe.db.get_value(link_doctype, {name_field: value}, "name")
-								setattr(task, key, link_id)
-								found = True
-								break
-						
-						# If not found, try get_all with filters
-						if not found:
-							# Get meta to find the main name field
-							link_meta = frappe.get_meta(link_doctype)
-							# Try to find by the first Data field that might be a name
-							for link_field in link_meta.fields:
-								if link_field.fieldtype == "Data" and link_field.fieldname not in ["name"]:
-									doc = frappe.get_all(link_doctype, filters={link_field.fieldname: value}, fields=["name"], limit=1)
-									if doc:
-										setattr(task, key, doc[0].name)
-										found = True
-										break
-						
-						# If still not found, skip it to avoid LinkValidationError
-						if not found:
-							pass  # Skip invalid link field
-					except Exception:
-						# If any error occurs, skip this field
-						pass
-			else:
-				# Not a link field, set directly
-				setattr(task, key, value)
+	updates = {
+		key: value
+		for key, value in kwargs.items()
+		if key in valid_fields and hasattr(task, key) and value is not None
+	}
+	resolved_links = _resolve_link_values(updates, link_fields)
+	for key, value in updates.items():
+		if key in link_fields:
+			# Accept the ID or a display name (title, lead_name, unit_name, ...);
+			# if nothing matches, skip it to avoid LinkValidationError
+			link_name = resolved_links.get(key)
+			if link_name:
+				setattr(task, key, link_name)
+		else:
+			# Not a link field, set directly
+			setattr(task, key, value)
 	
 	# Handle meeting_attendees (Table MultiSelect)
 	if meeting_attendees is not None:
 		if isinstance(meeting_attendees, str):
 			try:
-				meeting_attendees = frappe.parse_json(meeting_attendees)
+				meeting_attendees = json_loads(meeting_attendees)
 			except:
 				meeting_attendees = []
 		
 		if isinstance(meeting_attendees, list):
 			task.meeting_attendees = []
-			for attendee in meeting_attendees:
-				if isinstance(attendee, dict):
-					# Extract email from attendee object
-					attendee_email = attendee.get("email") or attendee.get("id")
-					if attendee_email:
-						# Ensure user exists from mobile data
-						attendee_email = _ensure_user_from_mobile_data(
-							email=attendee_email,
-							name=attendee.get("name"),
-							profile_pic=attendee.get("profile_pic"),
-							user_id=attendee.get("id")
-						)
-						if attendee_email:
-							task.append("meeting_attendees", {
-								"crm_task_user": attendee_email
-							})
-				elif isinstance(attendee, str):
-					# Direct email string
-					if attendee:
-						task.append("meeting_attendees", {
-							"crm_task_user": attendee
-						})
+			# Attendee objects are matched to users in one query; email strings are used as-is
+			for attendee_email in _ensure_users_from_mobile_data_bulk(meeting_attendees):
+				task.append("meeting_attendees", {
+					"crm_task_user": attendee_email
+				})
 	
 	task.save()
-	frappe.db.commit()
 	
 	# Handle assigned_to_list (multiple users via Frappe's assign_to system)
 	users_to_assign = []
 	if assigned_to_list is not None:
 		if isinstance(assigned_to_list, str):
 			try:
-				assigned_to_list = frappe.parse_json(assigned_to_list)
+				assigned_to_list = json_loads(assigned_to_list)
 			except:
 				assigned_to_list = [assigned_to_list]
 		
 		if isinstance(assigned_to_list, list):
-			for user_data in assigned_to_list:
-				if isinstance(user_data, dict):
-					# Extract email from user object
-					user_email = user_data.get("email") or user_data.get("id")
-					if user_email:
-						# Ensure user exists from mobile data
-						user_email = _ensure_user_from_mobile_data(
-							email=user_email,
-							name=user_data.get("name"),
-							profile_pic=user_data.get("profile_pic"),
-							user_id=user_data.get("id")
-						)
-						if user_email:
-							users_to_assign.append(user_email)
-				elif isinstance(user_data, str):
-					# Direct email string
-					if user_data:
-						users_to_assign.append(user_data)
+			# User objects are matched to users in one query; email strings are used as-is
+			users_to_assign.extend(_ensure_users_from_mobile_data_bulk(assigned_to_list))
 	
 	# Also add single assigned_to if provided
 	if assigned_to is not None:
@@ -1160,6 +1329,8 @@ def edit_task(task_id=None, name=None, title=None, status=None, priority=None, s
 	
 	# Update assignments: remove old ones and add new ones
 	if assigned_to_list is not None or assigned_to is not None:
+		from frappe.desk.form.assign_to import remove as unassign_task
+		
 		# Get current assigned users
 		current_todos = frappe.get_all(
 			"ToDo",
@@ -1181,18 +1352,9 @@ def edit_task(task_id=None, name=None, title=None, status=None, priority=None, s
 			except Exception as e:
 				frappe.log_error(f"Failed to unassign task {task.name} from {user_email}: {str(e)}", "Task Unassignment Error")
 		
-		# Add new users
-		users_to_add = set(users_to_assign) - current_users
-		for user_email in users_to_add:
-			try:
-				assign_task({
-					"doctype": "CRM Task",
-					"name": task.name,
-					"assign_to": [user_email],
-					"description": task.title or task.description or "",
-				})
-			except Exception as e:
-				frappe.log_error(f"Failed to assign task {task.name} to {user_email}: {str(e)}", "Task Assignment Error")
+		# Add new users in one assign_to call; the task and its assignment changes are
+		# committed together below
+		_assign_task_users(task, [u for u in users_to_assign if u not in current_users])
 	
 	frappe.db.commit()
 	
@@ -1278,6 +1440,63 @@ def update_status(task_id=None, name=None, status=None):
 	return get_compact_task(task)
 
 
+DATE_PARTS_RE = re.compile(r"(\d+)-(\d+)-(\d+)")
+
+
+def _normalize_date(date_str):
+	"""Normalize a date filter value (DD-MM-YYYY to YYYY-MM-DD)."""
+	if not date_str:
+		return None
+	date_str = str(date_str).strip()
+	match = DATE_PARTS_RE.fullmatch(date_str)
+	if not match:
+		return date_str
+	part1, part2, part3 = (int(part) for part in match.groups())
+	if part1 > 31:
+		return date_str
+	elif part2 > 12 or part1 > 12:
+		return f"{part3}-{part2:02d}-{part1:02d}"
+	return date_str
+
+
+def _get_all_with_total(doctype, filters=None, fields=None, order_by=None, limit_start=0, limit_page_length=20):
+	"""
+	frappe.get_all rows of one page plus the total number of matching rows. The total is
+	read from a COUNT(*) OVER () column of the same query, so the filters are evaluated
+	once instead of again by a separate frappe.db.count.
+
+	There is deliberately no distinct / group_by: the window column is prepended to the
+	select list get_all built (after it sanitised the requested fields), which is only
+	valid for a plain select.
+	"""
+	query = frappe.get_all(
+		doctype,
+		filters=filters,
+		fields=fields,
+		order_by=order_by,
+		limit_start=limit_start,
+		limit_page_length=limit_page_length,
+		run=0,
+	)
+	counted_query, found = re.subn(
+		r"^\s*select\s(?!\s*distinct\b)", "select count(*) over () as _total, ", query, count=1, flags=re.IGNORECASE
+	)
+	if not found:
+		# Not the plain select we expect, run it as is and count separately
+		rows = frappe.db.sql(query, as_dict=True)
+		return rows, frappe.db.count(doctype, filters=filters)
+
+	rows = frappe.db.sql(counted_query, as_dict=True)
+	if rows:
+		total = rows[0]._total
+	else:
+		# Past the last page the window has no rows to count
+		total = frappe.db.count(doctype, filters=filters) if limit_start else 0
+	for row in rows:
+		row.pop("_total", None)
+	return rows, total
+
+
 @frappe.whitelist()
 def filter_tasks(date_from=None, date_to=None, importance=None, status=None,
 				 limit=20, page=1, order_by="modified desc"):
@@ -1335,8 +1554,8 @@ def filter_tasks(date_from=None, date_to=None, importance=None, status=None,
 	               "assigned_to", "modified", "description"]
 	fields = _safe_fields("CRM Task", base_fields)
 	
-	# Get tasks with pagination
-	tasks = frappe.get_all(
+	# Get tasks with pagination, and the total count of matching tasks
+	tasks, total = _get_all_with_total(
 		"CRM Task",
 		filters=filters,
 		fields=fields,
@@ -1345,11 +1564,8 @@ def filter_tasks(date_from=None, date_to=None, importance=None, status=None,
 		limit_page_length=limit
 	)
 	
-	# Get total count of matching tasks
-	total = frappe.db.count("CRM Task", filters=filters)
-	
 	# Format tasks using compact helper
-	data = [get_compact_task(task) for task in tasks]
+	data = get_compact_tasks(tasks)
 	
 	# Calculate if there are more pages
 	has_next = (start + len(data)) < total
@@ -1410,24 +1626,40 @@ def get_all_tasks(page=1, limit=20, order_by="modified desc",
 			}
 		}
 	"""
-	# Get parameters from form_dict for GET requests
-	if hasattr(frappe, 'form_dict') and frappe.form_dict:
-		# Override with form_dict values (query string takes precedence)
-		status = frappe.form_dict.get('status') if 'status' in frappe.form_dict else status
-		task_type = frappe.form_dict.get('task_type') if 'task_type' in frappe.form_dict else task_type
-		title = frappe.form_dict.get('title') if 'title' in frappe.form_dict else title
-		priority = frappe.form_dict.get('priority') if 'priority' in frappe.form_dict else priority
-		start_date_from = frappe.form_dict.get('start_date_from') if 'start_date_from' in frappe.form_dict else start_date_from
-		start_date_to = frappe.form_dict.get('start_date_to') if 'start_date_to' in frappe.form_dict else start_date_to
-		due_date_from = frappe.form_dict.get('due_date_from') if 'due_date_from' in frappe.form_dict else due_date_from
-		due_date_to = frappe.form_dict.get('due_date_to') if 'due_date_to' in frappe.form_dict else due_date_to
-		assigned_to = frappe.form_dict.get('assigned_to') if 'assigned_to' in frappe.form_dict else assigned_to
-		reference_doctype = frappe.form_dict.get('reference_doctype') if 'reference_doctype' in frappe.form_dict else reference_doctype
-		reference_docname = frappe.form_dict.get('reference_docname') if 'reference_docname' in frappe.form_dict else reference_docname
-		description = frappe.form_dict.get('description') if 'description' in frappe.form_dict else description
-		page = frappe.form_dict.get('page') if 'page' in frappe.form_dict else page
-		limit = frappe.form_dict.get('limit') if 'limit' in frappe.form_dict else limit
-		order_by = frappe.form_dict.get('order_by') if 'order_by' in frappe.form_dict else order_by
+	# Get parameters from form_dict for GET requests (query string takes precedence)
+	params = {
+		"status": status,
+		"task_type": task_type,
+		"title": title,
+		"priority": priority,
+		"start_date_from": start_date_from,
+		"start_date_to": start_date_to,
+		"due_date_from": due_date_from,
+		"due_date_to": due_date_to,
+		"assigned_to": assigned_to,
+		"reference_doctype": reference_doctype,
+		"reference_docname": reference_docname,
+		"description": description,
+		"page": page,
+		"limit": limit,
+		"order_by": order_by,
+	}
+	params.update((key, value) for key, value in (frappe.form_dict or {}).items() if key in params)
+	status = params["status"]
+	task_type = params["task_type"]
+	title = params["title"]
+	priority = params["priority"]
+	start_date_from = params["start_date_from"]
+	start_date_to = params["start_date_to"]
+	due_date_from = params["due_date_from"]
+	due_date_to = params["due_date_to"]
+	assigned_to = params["assigned_to"]
+	reference_doctype = params["reference_doctype"]
+	reference_docname = params["reference_docname"]
+	description = params["description"]
+	page = params["page"]
+	limit = params["limit"]
+	order_by = params["order_by"]
 	
 	page = cint(page) or 1
 	limit = cint(limit) or 20
@@ -1467,41 +1699,16 @@ def get_all_tasks(page=1, limit=20, order_by="modified desc",
 		else:
 			filters.append(["priority", "=", priority])
 	
-	# Helper function to normalize date format (DD-MM-YYYY to YYYY-MM-DD)
-	def normalize_date(date_str):
-		if not date_str:
-			return None
-		date_str = str(date_str).strip()
-		if "-" in date_str:
-			parts = date_str.split("-")
-			if len(parts) == 3:
-				try:
-					part1 = int(parts[0])
-					part2 = int(parts[1])
-					part3 = int(parts[2])
-					
-					if part1 > 31:
-						return date_str
-					elif part1 <= 31 and part2 > 12:
-						return f"{part3}-{part2:02d}-{part1:02d}"
-					elif part1 > 12 and part2 <= 12:
-						return f"{part3}-{part2:02d}-{part1:02d}"
-					else:
-						return date_str
-				except ValueError:
-					return date_str
-		return date_str
-	
 	# Start Date filters (normalize date format)
 	if start_date_from:
-		start_date_from = normalize_date(start_date_from)
+		start_date_from = _normalize_date(start_date_from)
 		if start_date_from:
 			if len(start_date_from) == 10:  # YYYY-MM-DD format
 				filters.append(["start_date", ">=", f"{start_date_from} 00:00:00"])
 			else:
 				filters.append(["start_date", ">=", start_date_from])
 	if start_date_to:
-		start_date_to = normalize_date(start_date_to)
+		start_date_to = _normalize_date(start_date_to)
 		if start_date_to:
 			if len(start_date_to) == 10:  # YYYY-MM-DD format
 				filters.append(["start_date", "<=", f"{start_date_to} 23:59:59"])
@@ -1510,14 +1717,14 @@ def get_all_tasks(page=1, limit=20, order_by="modified desc",
 	
 	# Due Date filters (normalize date format)
 	if due_date_from:
-		due_date_from = normalize_date(due_date_from)
+		due_date_from = _normalize_date(due_date_from)
 		if due_date_from:
 			if len(due_date_from) == 10:  # YYYY-MM-DD format
 				filters.append(["due_date", ">=", f"{due_date_from} 00:00:00"])
 			else:
 				filters.append(["due_date", ">=", due_date_from])
 	if due_date_to:
-		due_date_to = normalize_date(due_date_to)
+		due_date_to = _normalize_date(due_date_to)
 		if due_date_to:
 			if len(due_date_to) == 10:  # YYYY-MM-DD format
 				filters.append(["due_date", "<=", f"{due_date_to} 23:59:59"])
@@ -1546,9 +1753,6 @@ def get_all_tasks(page=1, limit=20, order_by="modified desc",
 	if description:
 		filters.append(["description", "like", f"%{description}%"])
 	
-	# Get total count with filters
-	total = frappe.db.count("CRM Task", filters=filters if filters else None)
-	
 	# Get safe fields for CRM Task
 	base_fields = ["name", "title", "status", "priority", "start_date", "due_date", 
 	               "assigned_to", "modified", "description", "task_type", "lead", "project", 
@@ -1556,8 +1760,8 @@ def get_all_tasks(page=1, limit=20, order_by="modified desc",
 	               "creation", "owner", "modified_by"]
 	fields = _safe_fields("CRM Task", base_fields)
 	
-	# Get tasks with pagination
-	tasks = frappe.get_all(
+	# Get tasks with pagination, and the total count with filters
+	tasks, total = _get_all_with_total(
 		"CRM Task",
 		filters=filters if filters else None,
 		fields=fields,
@@ -1567,7 +1771,7 @@ def get_all_tasks(page=1, limit=20, order_by="modified desc",
 	)
 	
 	# Format tasks using compact helper
-	data = [get_compact_task(task, return_all_fields=True) for task in tasks]
+	data = get_compact_tasks(tasks, return_all_fields=True)
 	
 	# Add reminder_at to each task
 	if data:
@@ -1613,6 +1817,51 @@ def get_all_tasks(page=1, limit=20, order_by="modified desc",
 			"has_previous": has_previous
 		}
 	}
+
+
+def _get_tasks_with_all_fields(filters, order_by, page_length):
+	"""
+	Tasks with all their fields (as get_compact_task returns for a full document), read
+	with one get_all plus one query for the meeting attendees of the whole page.
+	"""
+	meta = frappe.get_meta("CRM Task")
+	fields = ["name", "modified", "creation", "owner", "modified_by"] + [
+		f.fieldname for f in meta.fields if f.fieldtype not in no_value_fields
+	]
+	tasks = frappe.get_all(
+		"CRM Task",
+		filters=filters,
+		fields=fields,
+		order_by=order_by,
+		page_length=page_length
+	)
+	if not tasks:
+		return []
+	
+	# Table MultiSelect rows, as they'd be serialized from the loaded document
+	attendees = {}
+	for row in frappe.get_all(
+		"CRM Task User",
+		filters={
+			"parenttype": "CRM Task",
+			"parentfield": "meeting_attendees",
+			"parent": ["in", [task.name for task in tasks]],
+		},
+		fields=["*"],
+		order_by="idx asc",
+	):
+		row.doctype = "CRM Task User"
+		attendees.setdefault(row.parent, []).append(row)
+	for task in tasks:
+		task.meeting_attendees = attendees.get(task.name, [])
+	
+	results = get_compact_tasks(tasks, return_all_fields=True)
+	for result in results:
+		# Always included for full documents, even if empty
+		result.setdefault("description", None)
+	return results
+
+
 @frappe.whitelist()
 def home_tasks(limit=5):
 	"""
@@ -1628,30 +1877,17 @@ def home_tasks(limit=5):
 	today_date = today()
 	tomorrow_date = add_days(today_date, 1)
 	
-	# Get task names first (lightweight query)
 	# NOTE: Using start_date (not due_date) to filter today's tasks
 	# start_date is Datetime field, so we need to use range filter
-	task_names = frappe.get_all(
-		"CRM Task",
+	data = _get_tasks_with_all_fields(
 		filters=[
 			["start_date", ">=", f"{today_date} 00:00:00"],
 			["start_date", "<", f"{tomorrow_date} 00:00:00"]
 		],
-		fields=["name"],
 		order_by="priority desc, modified desc",
 		page_length=cint(limit) or 5
 	)
 	
-	# Get full task documents with all fields
-	data = []
-	for task_name_obj in task_names:
-		try:
-			task_doc = frappe.get_doc("CRM Task", task_name_obj.name)
-			data.append(get_compact_task(task_doc, return_all_fields=True))
-		except Exception:
-			# Skip tasks that can't be loaded (permissions, deleted, etc.)
-			continue
-	
 	return {
 		"today": data,
 		"limit": cint(limit) or 5
@@ -1683,29 +1919,9 @@ def main_page_buckets(min_each=5):
 	# Active statuses (not Done or Canceled)
 	active_statuses = ["Backlog", "Todo", "In Progress"]
 	
-	def get_tasks_with_all_fields(filters, order_by, page_length):
-		"""Helper to get task names first, then load full documents."""
-		task_names = frappe.get_all(
-			"CRM Task",
-			filters=filters,
-			fields=["name"],
-			order_by=order_by,
-			page_length=page_length
-		)
-		
-		tasks = []
-		for task_name_obj in task_names:
-			try:
-				task_doc = frappe.get_doc("CRM Task", task_name_obj.name)
-				tasks.append(get_compact_task(task_doc, return_all_fields=True))
-			except Exception:
-				# Skip tasks that can't be loaded (permissions, deleted, etc.)
-				continue
-		return tasks
-	
 	# Today's tasks - using start_date (not due_date)
 	# start_date is Datetime field, so we need to use range filter
-	today_tasks = get_tasks_with_all_fields(
+	today_tasks = _get_tasks_with_all_fields(
 		filters=[
 			["start_date", ">=", f"{today_date} 00:00:00"],
 			["start_date", "<", f"{tomorrow_date} 00:00:00"]
@@ -1715,7 +1931,7 @@ def main_page_buckets(min_each=5):
 	)
 	
 	# Late tasks (before today and still active) - using start_date (not due_date)
-	late_tasks = get_tasks_with_all_fields(
+	late_tasks = _get_tasks_with_all_fields(
 		filters=[
 			["start_date", "<", f"{today_date} 00:00:00"],
 			["status", "in", active_statuses]
@@ -1725,7 +1941,7 @@ def main_page_buckets(min_each=5):
 	)
 	
 	# Upcoming tasks (after today) - using start_date (not due_date)
-	upcoming_tasks = get_tasks_with_all_fields(
+	upcoming_tasks = _get_tasks_with_all_fields(
 		filters=[["start_date", ">=", f"{tomorrow_date} 00:00:00"]],
 		order_by="start_date asc, priority desc",
 		page_length=min_count
@@ -2120,9 +2336,9 @@ def get_my_team_members():
 	}
 
 
-def get_compact_lead(lead, return_all_fields=False):
+def _compact_lead_fields(lead, return_all_fields=False):
 	"""
-	Return lead representation.
+	Lead representation without link names expanded.
 	Accepts both Document objects and dict-like objects (frappe._dict).
 	
 	Args:
@@ -2199,95 +2415,32 @@ def get_compact_lead(lead, return_all_fields=False):
 		if organization is not None:
 			result["organization"] = organization
 	
-	# Expand link fields to return names instead of IDs
-	# Status field - return status name
-	status_id = _get(result, "status")
-	if status_id:
-		try:
-			status_doc = frappe.get_doc("CRM Lead Status", status_id)
-			result["status"] = status_doc.get("lead_status") or status_id
-			result["status_id"] = status_id
-		except Exception:
-			result["status_id"] = status_id
-	
-	# Source field - return source name
-	source_id = _get(result, "source")
-	if source_id:
-		try:
-			source_doc = frappe.get_doc("CRM Lead Source", source_id)
-			result["source"] = source_doc.get("source_name") or source_id
-			result["source_id"] = source_id
-		except Exception:
-			result["source_id"] = source_id
-	
-	# Industry field - return industry name
-	industry_id = _get(result, "industry")
-	if industry_id:
-		try:
-			industry_doc = frappe.get_doc("CRM Industry", industry_id)
-			result["industry"] = industry_doc.get("industry_name") or industry_id
-			result["industry_id"] = industry_id
-		except Exception:
-			result["industry_id"] = industry_id
-	
-	# Lead Owner field - return user full name
-	lead_owner_id = _get(result, "lead_owner")
-	if lead_owner_id:
-		try:
-			user_doc = frappe.get_doc("User", lead_owner_id)
-			result["lead_owner"] = user_doc.get("full_name") or user_doc.get("name") or lead_owner_id
-			result["lead_owner_id"] = lead_owner_id
-		except Exception:
-			result["lead_owner_id"] = lead_owner_id
-	
-	# Project field - return project_name instead of ID
-	project_id = _get(result, "project")
-	if project_id:
-		try:
-			project_doc = frappe.get_doc("Real Estate Project", project_id)
-			project_name = project_doc.get("project_name") or project_id
-			result["project"] = project_name
-			result["project_id"] = project_id
-		except Exception:
-			result["project_id"] = project_id
-	
-	# Project Unit field - return unit_name instead of ID
-	project_unit_id = _get(result, "project_unit")
-	if project_unit_id:
-		try:
-			project_unit_doc = frappe.get_doc("Project Unit", project_unit_id)
-			project_unit_name = project_unit_doc.get("unit_name") or project_unit_doc.get("name") or project_unit_id
-			result["project_unit"] = project_unit_name
-			result["project_unit_id"] = project_unit_id
-		except Exception:
-			result["project_unit_id"] = project_unit_id
-	
-	# Single Unit field - return unit_name instead of ID
-	single_unit_id = _get(result, "single_unit")
-	if single_unit_id:
-		try:
-			unit_doc = frappe.get_doc("Unit", single_unit_id)
-			unit_name = unit_doc.get("unit_name") or unit_doc.get("name") or single_unit_id
-			result["single_unit"] = unit_name
-			result["single_unit_id"] = single_unit_id
-		except Exception:
-			result["single_unit_id"] = single_unit_id
-	
-	# Get assigned users from ToDo records only (ignore assigned_to field)
-	# This matches what's shown in the left sidebar in Frappe UI
-	try:
-		if lead_name:  # Only get assigned users if lead_name is not None
-			assigned_users = _get_assigned_users("CRM Lead", lead_name)
-			result["assigned_to"] = assigned_users if assigned_users else []
-		else:
-			result["assigned_to"] = []
-	except Exception:
-		# Error getting assigned users, return empty array
-		result["assigned_to"] = []
-	
 	return result
 
 
+def get_compact_leads(leads, return_all_fields=False):
+	"""
+	Serialize many leads at once; status/source/owner/project/unit names are fetched with
+	one query per linked doctype instead of a get_doc per lead and link.
+	"""
+	results = [_compact_lead_fields(lead, return_all_fields) for lead in leads]
+	_expand_links(results, LEAD_LINK_EXPANSIONS)
+	_attach_assignees("CRM Lead", results)
+	return results
+
+
+def get_compact_lead(lead, return_all_fields=False):
+	"""
+	Return lead representation.
+	Accepts both Document objects and dict-like objects (frappe._dict).
+	
+	Args:
+		lead: Lead document or dict
+		return_all_fields: If True, return all available fields from lead object
+	"""
+	return get_compact_leads([lead], return_all_fields)[0]
+
+
 @frappe.whitelist()
 def create_lead(lead_name=None, first_name=None, last_name=None, middle_name=None,
 			   email=None, mobile_no=None, phone=None, organization=None,
@@ -2438,8 +2591,7 @@ def create_lead(lead_name=None, first_name=None, last_name=None, middle_name=Non
 				frappe.throw(_("Cannot find Unit: {0}").format(single_unit))
 	
 	# Update any other valid fields from kwargs
-	lead_meta = frappe.get_meta("CRM Lead")
-	valid_fields = {f.fieldname for f in lead_meta.fields}
+	valid_fields = _doctype_docfield_names("CRM Lead")
 	for key, value in kwargs.items():
 		if key in valid_fields and hasattr(lead_doc, key) and value is not None:
 			setattr(lead_doc, key, value)
@@ -2488,29 +2640,15 @@ def create_lead(lead_name=None, first_name=None, last_name=None, middle_name=Non
 	if assigned_to_list is not None:
 		if isinstance(assigned_to_list, str):
 			try:
-				assigned_to_list = frappe.parse_json(assigned_to_list)
+				assigned_to_list = json_loads(assigned_to_list)
 			except:
 				assigned_to_list = [assigned_to_list]
 		
 		if isinstance(assigned_to_list, list):
-			for user_data in assigned_to_list:
-				if isinstance(user_data, dict):
-					# Extract email from user object
-					user_email = user_data.get("email") or user_data.get("id")
-					if user_email:
-						# Ensure user exists from mobile data
-						user_email = _ensure_user_from_mobile_data(
-							email=user_email,
-							name=user_data.get("name"),
-							profile_pic=user_data.get("profile_pic"),
-							user_id=user_data.get("id")
-						)
-						if user_email and user_email not in users_to_assign:
-							users_to_assign.append(user_email)
-				elif isinstance(user_data, str):
-					# Direct email string
-					if user_data and user_data not in users_to_assign:
-						users_to_assign.append(user_data)
+			# User objects are matched to users in one query; email strings are used as-is
+			for user_email in _ensure_users_from_mobile_data_bulk(assigned_to_list):
+				if user_email not in users_to_assign:
+					users_to_assign.append(user_email)
 	
 	# Also add single assigned_to if provided (only if it's a string, not a list)
 	# If assigned_to was a list, it was already converted to assigned_to_list above
@@ -2520,21 +2658,9 @@ def create_lead(lead_name=None, first_name=None, last_name=None, middle_name=Non
 				users_to_assign.append(assigned_to)
 		elif isinstance(assigned_to, list):
 			# Handle list of dicts (like mobile app sends)
-			for user_data in assigned_to:
-				if isinstance(user_data, dict):
-					user_email = user_data.get("email") or user_data.get("id")
-					if user_email:
-						user_email = _ensure_user_from_mobile_data(
-							email=user_email,
-							name=user_data.get("name"),
-							profile_pic=user_data.get("profile_pic"),
-							user_id=user_data.get("id")
-						)
-						if user_email and user_email not in users_to_assign:
-							users_to_assign.append(user_email)
-				elif isinstance(user_data, str):
-					if user_data and user_data not in users_to_assign:
-						users_to_assign.append(user_data)
+			for user_email in _ensure_users_from_mobile_data_bulk(assigned_to):
+				if user_email not in users_to_assign:
+					users_to_assign.append(user_email)
 	
 	# Ensure all items in users_to_assign are strings (not lists)
 	users_to_assign = [u for u in users_to_assign if isinstance(u, str) and u]
@@ -2549,6 +2675,8 @@ def create_lead(lead_name=None, first_name=None, last_name=None, middle_name=Non
 			frappe.db.set_value("CRM Lead", lead_doc.name, "assigned_date", today())
 			frappe.db.commit()
 	
+	from frappe.desk.form.assign_to import add as assign_task
+	
 	for user_email in users_to_assign:
 		try:
 			assign_task({
@@ -2599,8 +2727,7 @@ def edit_lead(lead_id=None, name=None, lead_name=None, first_name=None, last_nam
 	lead = frappe.get_doc("CRM Lead", name)
 	
 	# Get CRM Lead meta to validate fields
-	lead_meta = frappe.get_meta("CRM Lead")
-	valid_fields = {f.fieldname for f in lead_meta.fields}
+	valid_fields = _doctype_docfield_names("CRM Lead")
 	
 	# Update standard fields if provided
 	if lead_name is not None:
@@ -2723,29 +2850,15 @@ def edit_lead(lead_id=None, name=None, lead_name=None, first_name=None, last_nam
 	if assigned_to_list is not None:
 		if isinstance(assigned_to_list, str):
 			try:
-				assigned_to_list = frappe.parse_json(assigned_to_list)
+				assigned_to_list = json_loads(assigned_to_list)
 			except:
 				assigned_to_list = [assigned_to_list]
 		
 		if isinstance(assigned_to_list, list):
-			for user_data in assigned_to_list:
-				if isinstance(user_data, dict):
-					# Extract email from user object
-					user_email = user_data.get("email") or user_data.get("id")
-					if user_email:
-						# Ensure user exists from mobile data
-						user_email = _ensure_user_from_mobile_data(
-							email=user_email,
-							name=user_data.get("name"),
-							profile_pic=user_data.get("profile_pic"),
-							user_id=user_data.get("id")
-						)
-						if user_email and user_email not in users_to_assign:
-							users_to_assign.append(user_email)
-				elif isinstance(user_data, str):
-					# Direct email string
-					if user_data and user_data not in users_to_assign:
-						users_to_assign.append(user_data)
+			# User objects are matched to users in one query; email strings are used as-is
+			for user_email in _ensure_users_from_mobile_data_bulk(assigned_to_list):
+				if user_email not in users_to_assign:
+					users_to_assign.append(user_email)
 	
 	# Also add single assigned_to if provided (only if it's a string, not a list)
 	# If assigned_to was a list, it was already converted to assigned_to_list above
@@ -2755,27 +2868,18 @@ def edit_lead(lead_id=None, name=None, lead_name=None, first_name=None, last_nam
 				users_to_assign.append(assigned_to)
 		elif isinstance(assigned_to, list):
 			# Handle list of dicts (like mobile app sends)
-			for user_data in assigned_to:
-				if isinstance(user_data, dict):
-					user_email = user_data.get("email") or user_data.get("id")
-					if user_email:
-						user_email = _ensure_user_from_mobile_data(
-							email=user_email,
-							name=user_data.get("name"),
-							profile_pic=user_data.get("profile_pic"),
-							user_id=user_data.get("id")
-						)
-						if user_email and user_email not in users_to_assign:
-							users_to_assign.append(user_email)
-				elif isinstance(user_data, str):
-					if user_data and user_data not in users_to_assign:
-						users_to_assign.append(user_data)
+			for user_email in _ensure_users_from_mobile_data_bulk(assigned_to):
+				if user_email not in users_to_assign:
+					users_to_assign.append(user_email)
 	
 	# Ensure all items in users_to_assign are strings (not lists)
 	users_to_assign = [u for u in users_to_assign if isinstance(u, str) and u]
 	
 	# Update assignments: remove old ones and add new ones
 	if assigned_to_list is not None or assigned_to is not None:
+		from frappe.desk.form.assign_to import add as assign_task
+		from frappe.desk.form.assign_to import remove as unassign_task
+		
 		# Get current assigned users
 		current_todos = frappe.get_all(
 			"ToDo",
@@ -3246,41 +3350,16 @@ def get_all_leads(page=1, limit=20, order_by="modified desc",
 	if assigned_date and str(assigned_date).strip():
 		filters.append(["assigned_date", "=", assigned_date])
 	
-	# Helper function to normalize date format (DD-MM-YYYY to YYYY-MM-DD)
-	def normalize_date(date_str):
-		if not date_str:
-			return None
-		date_str = str(date_str).strip()
-		if "-" in date_str:
-			parts = date_str.split("-")
-			if len(parts) == 3:
-				try:
-					part1 = int(parts[0])
-					part2 = int(parts[1])
-					part3 = int(parts[2])
-					
-					if part1 > 31:
-						return date_str
-					elif part1 <= 31 and part2 > 12:
-						return f"{part3}-{part2:02d}-{part1:02d}"
-					elif part1 > 12 and part2 <= 12:
-						return f"{part3}-{part2:02d}-{part1:02d}"
-					else:
-						return date_str
-				except ValueError:
-					return date_str
-		return date_str
-	
 	# Creation date filters
 	if creation_from:
-		creation_from = normalize_date(creation_from)
+		creation_from = _normalize_date(creation_from)
 		if creation_from:
 			if len(creation_from) == 10:
 				filters.append(["creation", ">=", f"{creation_from} 00:00:00"])
 			else:
 				filters.append(["creation", ">=", creation_from])
 	if creation_to:
-		creation_to = normalize_date(creation_to)
+		creation_to = _normalize_date(creation_to)
 		if creation_to:
 			if len(creation_to) == 10:
 				filters.append(["creation", "<=", f"{creation_to} 23:59:59"])
@@ -3289,14 +3368,14 @@ def get_all_leads(page=1, limit=20, order_by="modified desc",
 	
 	# Modified date filters
 	if modified_from:
-		modified_from = normalize_date(modified_from)
+		modified_from = _normalize_date(modified_from)
 		if modified_from:
 			if len(modified_from) == 10:
 				filters.append(["modified", ">=", f"{modified_from} 00:00:00"])
 			else:
 				filters.append(["modified", ">=", modified_from])
 	if modified_to:
-		modified_to = normalize_date(modified_to)
+		modified_to = _normalize_date(modified_to)
 		if modified_to:
 			if len(modified_to) == 10:
 				filters.append(["modified", "<=", f"{modified_to} 23:59:59"])
@@ -3484,7 +3563,7 @@ def get_all_leads(page=1, limit=20, order_by="modified desc",
 	)
 	
 	# Format leads using compact helper
-	data = [get_compact_lead(lead, return_all_fields=True) for lead in leads]
+	data = get_compact_leads(leads, return_all_fields=True)
 	
 	# Filter by assigned_to if specified (check ToDo records)
 	if assigned_to and str(assigned_to).strip():
@@ -3852,41 +3931,16 @@ def get_all_comments(page=1, limit=None, order_by="creation desc",
 		delayed_val = cint(delayed)
 		filters.append(["delayed", "=", delayed_val])
 	
-	# Helper function to normalize date format (DD-MM-YYYY to YYYY-MM-DD)
-	def normalize_date(date_str):
-		if not date_str:
-			return None
-		date_str = str(date_str).strip()
-		if "-" in date_str:
-			parts = date_str.split("-")
-			if len(parts) == 3:
-				try:
-					part1 = int(parts[0])
-					part2 = int(parts[1])
-					part3 = int(parts[2])
-					
-					if part1 > 31:
-						return date_str
-					elif part1 <= 31 and part2 > 12:
-						return f"{part3}-{part2:02d}-{part1:02d}"
-					elif part1 > 12 and part2 <= 12:
-						return f"{part3}-{part2:02d}-{part1:02d}"
-					else:
-						return date_str
-				except ValueError:
-					return date_str
-		return date_str
-	
 	# Creation date filters
 	if creation_from:
-		creation_from = normalize_date(creation_from)
+		creation_from = _normalize_date(creation_from)
 		if creation_from:
 			if len(creation_from) == 10:
 				filters.append(["creation", ">=", f"{creation_from} 00:00:00"])
 			else:
 				filters.append(["creation", ">=", creation_from])
 	if creation_to:
-		creation_to = normalize_date(creation_to)
+		creation_to = _normalize_date(creation_to)
 		if creation_to:
 			if len(creation_to) == 10:
 				filters.append(["creation", "<=", f"{creation_to} 23:59:59"])
@@ -3895,14 +3949,14 @@ def get_all_comments(page=1, limit=None, order_by="creation desc",
 	
 	# Modified date filters
 	if modified_from:
-		modified_from = normalize_date(modified_from)
+		modified_from = _normalize_date(modified_from)
 		if modified_from:
 			if len(modified_from) == 10:
 				filters.append(["modified", ">=", f"{modified_from} 00:00:00"])
 			else:
 				filters.append(["modified", ">=", modified_from])
 	if modified_to:
-		modified_to = normalize_date(modified_to)
+		modified_to = _normalize_date(modified_to)
 		if modified_to:
 			if len(modified_to) == 10:
 				filters.append(["modified", "<=", f"{modified_to} 23:59:59"])
@@ -4645,7 +4699,7 @@ def create_task_with_reminder(
             if not reminder_user and assigned_to_list:
                 if isinstance(assigned_to_list, str):
                     try:
-                        assigned_to_list = frappe.parse_json(assigned_to_list)
+                        assigned_to_list = json_loads(assigned_to_list)
                     except:
                         assigned_to_list = [assigned_to_list]
                 
@@ -4853,7 +4907,7 @@ def get_compact_project(project, return_all_fields=False):
 				if key not in ['doctype'] and value is not None:
 					result[key] = value
 			if 'description' in result and result['description']:
-				result['description'] = strip_html(result['description']).strip()
+				result['description'] = _plain_description(result['description'])
 		else:
 			# Document object
 			for field in project.meta.fields:
@@ -4878,7 +4932,7 @@ def get_compact_project(project, return_all_fields=False):
 				result['modified_by'] = project.modified_by
 			
 			if 'description' in result and result['description']:
-				result['description'] = strip_html(result['description']).strip()
+				result['description'] = _plain_description(result['description'])
 	else:
 		result = {
 			"name": project_name,
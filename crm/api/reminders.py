@@ -50,9 +50,19 @@ def _coerce_datetime(value: str):
 
 REMINDER_DT = "Reminder"
 DELAYED_BATCH_LIMIT = 200
+REMINDER_SCHEMA_CACHE_KEY = "crm_reminder_schema"
+
 
 def _reminder_schema():
-    """ارجع السكيمة الحالية لجدول Reminder ديناميكيًا"""
+    """
+    ارجع السكيمة الحالية لجدول Reminder ديناميكيًا.
+    الأعمدة مابتتغيرش وقت التشغيل، فالنتيجة بتتخزن في redis لكل site (مشتركة بين كل
+    الـ workers) ويتم مسحها من clear_reminder_schema_cache لما الـ DocType يتعدل.
+    """
+    return frappe.cache().get_value(REMINDER_SCHEMA_CACHE_KEY, generator=_load_reminder_schema)
+
+
+def _load_reminder_schema():
     ref_dt = "reference_doctype" if _has_column(REMINDER_DT, "reference_doctype") else "reminder_doctype"
     ref_nm = "reference_name"    if _has_column(REMINDER_DT, "reference_name")    else "reminder_docname"
     return {
@@ -67,6 +77,12 @@ def _reminder_schema():
         "has_creation": _has_column(REMINDER_DT, "creation"),
     }
 
+def clear_reminder_schema_cache(doc, method=None):
+    """Doc-event hook (DocType / Custom Field): امسح كاش السكيمة لو التعديل على Reminder."""
+    if REMINDER_DT in (doc.get("name"), doc.get("dt")):
+        frappe.cache().delete_value(REMINDER_SCHEMA_CACHE_KEY)
+
+
 def _comment_delay_field() -> str | None:
     """
     رجّع اسم عمود علامة التأخير في Comment:
@@ -283,23 +299,23 @@ def _set_comment_delay_flag(
     if not col:
         return 0
 
-    query = [
-        "UPDATE `tabComment`",
-        f"SET `{col}`=%s",
-        "WHERE reference_doctype=%s",
-        "  AND reference_name=%s",
-        "  AND comment_type='Comment'",
+    conditions = [
+        "reference_doctype=%s",
+        "reference_name=%s",
+        "comment_type='Comment'",
+        f"IFNULL(`{col}`, 0)!=%s",
     ]
-    params = [value, doctype, name]
+    params = [doctype, name, value]
     if user:
-        query.append("  AND owner=%s")
+        conditions.append("owner=%s")
         params.append(user)
+    where = " AND ".join(conditions)
 
-    frappe.db.sql("\n".join(query), tuple(params))
-    try:
-        return int(getattr(frappe.db._cursor, "rowcount", 0))
-    except Exception:
-        return 0
+    # الصفوف اللي هتتغير فعلاً، بنعدّها قبل الـ UPDATE بدل ما نقرا rowcount من الـ driver
+    changed = frappe.db.sql(f"SELECT COUNT(*) FROM `tabComment` WHERE {where}", tuple(params))[0][0]
+    if changed:
+        frappe.db.sql(f"UPDATE `tabComment` SET `{col}`=%s WHERE {where}", (value, *params))
+    return int(changed)
 
 
 def _set_doc_delayed_flag(doctype: str, name: str, value: int) -> None:
@@ -323,36 +339,69 @@ def clear_delayed_flags(doctype: str, name: str) -> dict:
     return {"cleared": changed}
 
 
-@frappe.whitelist()
-def mark_overdue_comment(doctype: str, name: str) -> dict:
+def _get_overdue_reminders(doctype: str, name: str, *, limit: int | None = None) -> list[dict]:
     """
-    لو عندي Reminder متأخر (remind_at < الآن) للمستخدم على نفس المستند
-    ولم تتم إضافة كومنت أحدث من موعد التذكير → علّم آخر كومنت للمستخدم كـ delayed=1.
-    لو جدول Comment مافهوش عمود delayed → لا شيء (No-op).
+    كل الـ Reminders "المفتوحة/المجدولة" اللي موعدها فات على المستند، الأحدث أولاً.
+    بترجع user كمان عشان نفس النتيجة تخدم فحص المستخدم الحالي من غير query تانية.
+    المقارنة strict (remind_at < now) زي mark_overdue_comment الأصلية.
     """
-    _ensure_can_read(doctype, name)
-    col = _comment_delay_field()
-    if not col:
-        return {"updated": 0, "reason": "no_delayed_column"}
-
     schema = _reminder_schema()
-    user = frappe.session.user
-
-    # 1) آخر Reminder "مفتوح/مجدول" قبل الآن على نفس المستند (strict: < now)
     reminder_filters = {
         schema["ref_dt"]: doctype,
         schema["ref_nm"]: name,
+        "remind_at": ("<", now_datetime()),
     }
     if schema["has_status"]:
         reminder_filters["status"] = ["in", ["Open", "Scheduled"]]
 
-    overdue = frappe.get_all(
+    fields = ["name", "remind_at"]
+    if schema["has_user"]:
+        fields.append("user")
+
+    return frappe.get_all(
         REMINDER_DT,
-        filters=reminder_filters | {"remind_at": ("<", now_datetime())},
-        fields=["name", "remind_at"],
+        filters=reminder_filters,
+        fields=fields,
         order_by="remind_at desc",
-        limit=1,
+        limit=limit,
     )
+
+
+def _latest_overdue_at(doctype: str, name: str, user: str) -> tuple:
+    """
+    query واحدة بترجع (آخر موعد Reminder متأخر على المستند، آخر موعد متأخر لنفس المستخدم).
+    أي قيمة ممكن تكون None لو مفيش.
+    التمييز كمتأخر strict (remind_at < now)، وفحص المسح بتاع المستخدم بيشمل remind_at = now.
+    """
+    schema = _reminder_schema()
+    status_cond = " AND status IN ('Open', 'Scheduled')" if schema["has_status"] else ""
+    own_expr = "MAX(CASE WHEN `user` = %(user)s THEN remind_at END)" if schema["has_user"] else "NULL"
+
+    row = frappe.db.sql(
+        f"""
+        SELECT MAX(CASE WHEN remind_at < %(now)s THEN remind_at END) AS last_overdue,
+            {own_expr} AS last_own_overdue
+        FROM `tab{REMINDER_DT}`
+        WHERE `{schema['ref_dt']}` = %(doctype)s
+          AND `{schema['ref_nm']}` = %(name)s
+          AND remind_at <= %(now)s
+          {status_cond}
+        """,
+        {"doctype": doctype, "name": name, "user": user, "now": now_datetime()},
+        as_dict=1,
+    )[0]
+    return row.last_overdue, row.last_own_overdue
+
+
+def _mark_overdue_comment(doctype: str, name: str, overdue: list[dict]) -> dict:
+    """
+    نفس منطق mark_overdue_comment لكن على قائمة overdue متجابة مسبقًا
+    (مرتبة remind_at desc) بدل ما نعمل query جديدة.
+    """
+    col = _comment_delay_field()
+    if not col:
+        return {"updated": 0, "reason": "no_delayed_column"}
+
     if not overdue:
         # مفيش متأخر
         return {"updated": 0, "reason": "no_overdue_reminder"}
@@ -384,6 +433,22 @@ def mark_overdue_comment(doctype: str, name: str) -> dict:
     return {"updated": 0, "reason": "comment_is_newer_than_reminder"}
 
 
+@frappe.whitelist()
+def mark_overdue_comment(doctype: str, name: str) -> dict:
+    """
+    لو عندي Reminder متأخر (remind_at < الآن) للمستخدم على نفس المستند
+    ولم تتم إضافة كومنت أحدث من موعد التذكير → علّم آخر كومنت للمستخدم كـ delayed=1.
+    لو جدول Comment مافهوش عمود delayed → لا شيء (No-op).
+    """
+    _ensure_can_read(doctype, name)
+    if not _comment_delay_field():
+        return {"updated": 0, "reason": "no_delayed_column"}
+
+    # 1) آخر Reminder "مفتوح/مجدول" قبل الآن على نفس المستند
+    overdue = _get_overdue_reminders(doctype, name, limit=1)
+    return _mark_overdue_comment(doctype, name, overdue)
+
+
 # -----------------------------
 # Helper endpoints for Delayed flow (NEW)
 # -----------------------------
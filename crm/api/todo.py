@@ -1,7 +1,7 @@
 import frappe
 from frappe import _
 from frappe.utils import today
-from crm.fcrm.doctype.crm_notification.crm_notification import notify_user
+from crm.fcrm.doctype.crm_notification.crm_notification import notify_user, notify_users_bulk
 
 
 def after_insert(doc, method):
@@ -33,6 +33,8 @@ def after_insert(doc, method):
         doc.reference_type in ["CRM Lead", "CRM Deal", "CRM Task"]
         and doc.reference_name
         and doc.allocated_to
+        # bulk assignment sends these in one batch, see crm.api.doc.assign_without_rule
+        and not frappe.flags.crm_defer_assignment_notifications
     ):
         notify_assigned_user(doc)
 
@@ -44,6 +46,8 @@ def on_update(doc, method):
         and doc.reference_type in ["CRM Lead", "CRM Deal", "CRM Task"]
         and doc.reference_name
         and doc.allocated_to
+        # bulk unassignment sends these in one batch, see crm.api.doc.remove_multiple_assignments
+        and not frappe.flags.crm_defer_assignment_notifications
     ):
         notify_assigned_user(doc, is_cancelled=True)
 
@@ -80,6 +84,83 @@ def notify_assigned_user(doc, is_cancelled=False):
     )
 
 
+def notify_cancelled_assignments(reference_type, todos):
+    """
+    Bulk version of notify_assigned_user(doc, is_cancelled=True) for ToDos cancelled
+    while crm_defer_assignment_notifications was set (so on_update skipped them).
+    `todos` are rows with reference_name and allocated_to.
+    """
+    notify_assignments(reference_type, todos, is_cancelled=True)
+
+
+def notify_assignments(reference_type, todos, is_cancelled=False):
+    """
+    Bulk version of notify_assigned_user for many ToDos of one reference doctype.
+    `todos` are rows with reference_name and allocated_to.
+    """
+    reference_fields = {
+        "CRM Lead": ["name", "lead_name"],
+        "CRM Deal": ["name", "organization", "lead_name"],
+        "CRM Task": ["name", "title", "reference_doctype", "reference_docname"],
+    }
+    if reference_type not in reference_fields:
+        return
+
+    todos = [t for t in todos if t.get("reference_name") and t.get("allocated_to")]
+    if not todos:
+        return
+
+    reference_docs = {
+        d.name: d
+        for d in frappe.get_all(
+            reference_type,
+            filters={"name": ["in", list({t["reference_name"] for t in todos})]},
+            fields=reference_fields[reference_type],
+        )
+    }
+    owner = frappe.get_cached_value("User", frappe.session.user, "full_name")
+
+    notifications = []
+    for todo in todos:
+        reference_doc = reference_docs.get(todo["reference_name"])
+        if not reference_doc:
+            continue
+        doc = frappe._dict(
+            reference_type=reference_type,
+            reference_name=todo["reference_name"],
+            allocated_to=todo["allocated_to"],
+        )
+        if reference_type == "CRM Task":
+            redirect_to_doctype = reference_doc.reference_doctype
+            redirect_to_name = reference_doc.reference_docname
+        else:
+            redirect_to_doctype, redirect_to_name = reference_type, doc.reference_name
+
+        notifications.append(
+            {
+                "owner": frappe.session.user,
+                "assigned_to": doc.allocated_to,
+                "notification_type": "Assignment",
+                "message": (
+                    _("Your assignment on {0} {1} has been removed by {2}").format(
+                        reference_type, doc.reference_name, owner
+                    )
+                    if is_cancelled
+                    else _("{0} assigned a {1} {2} to you").format(
+                        owner, reference_type, doc.reference_name
+                    )
+                ),
+                "notification_text": get_notification_text(owner, doc, reference_doc, is_cancelled),
+                "reference_doctype": reference_type,
+                "reference_docname": doc.reference_name,
+                "redirect_to_doctype": redirect_to_doctype,
+                "redirect_to_docname": redirect_to_name,
+            }
+        )
+
+    notify_users_bulk(notifications)
+
+
 def get_notification_text(owner, doc, reference_doc, is_cancelled=False):
     name = doc.reference_name
     doctype = doc.reference_type
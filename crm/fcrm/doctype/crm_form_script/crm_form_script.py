@@ -5,6 +5,8 @@ import frappe
 from frappe import _
 from frappe.model.document import Document
 
+FORM_SCRIPT_CACHE_KEY = "crm_form_scripts"
+
 
 class CRMFormScript(Document):
 	def validate(self):
@@ -23,8 +25,27 @@ class CRMFormScript(Document):
 			else:
 				frappe.throw(_("You need to be in developer mode to edit a Standard Form Script"))
 
+	def on_update(self):
+		clear_form_script_cache()
+
+	def on_trash(self):
+		clear_form_script_cache()
+
+
 def get_form_script(dt, view="Form"):
 	"""Returns the form script for the given doctype"""
+	# wrapped in a dict so that "no script" (None) is cached as well
+	cached = frappe.cache().hget(
+		FORM_SCRIPT_CACHE_KEY, f"{dt}:{view}", generator=lambda: {"script": _get_form_script(dt, view)}
+	)
+	return cached["script"]
+
+
+def clear_form_script_cache():
+	frappe.cache().delete_value(FORM_SCRIPT_CACHE_KEY)
+
+
+def _get_form_script(dt, view):
 	FormScript = frappe.qb.DocType("CRM Form Script")
 	query = (
 		frappe.qb.from_(FormScript)
@@ -6,4 +6,14 @@ from frappe.model.document import Document
 
 
 class CRMGlobalSettings(Document):
-	pass
+	def on_update(self):
+		self.clear_quick_filters_cache()
+
+	def on_trash(self):
+		self.clear_quick_filters_cache()
+
+	def clear_quick_filters_cache(self):
+		if self.type == "Quick Filters":
+			from crm.api.doc import clear_quick_filters_cache
+
+			clear_quick_filters_cache(self.dt)
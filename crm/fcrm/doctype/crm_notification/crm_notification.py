@@ -4,6 +4,7 @@
 import frappe
 from frappe import _
 from frappe.model.document import Document
+from frappe.utils import now_datetime
 
 
 class CRMNotification(Document):
@@ -19,7 +20,64 @@ def notify_user(args):
 	if args.owner == args.assigned_to:
 		return
 
-	values = frappe._dict(
+	values = get_notification_values(args)
+
+	if frappe.db.exists("CRM Notification", values):
+		return
+	frappe.get_doc(values).insert(ignore_permissions=True)
+
+
+def notify_users_bulk(args_list):
+	"""
+	Notify several users with a single insert, same rules as notify_user
+	"""
+	notifications = []
+	for args in args_list:
+		args = frappe._dict(args)
+		if args.owner == args.assigned_to:
+			continue
+		notifications.append(get_notification_values(args))
+
+	if not notifications:
+		return
+
+	value_fields = [f for f in notifications[0] if f != "doctype"]
+	existing = frappe.get_all(
+		"CRM Notification",
+		filters={
+			"to_user": ["in", list({n.to_user for n in notifications})],
+			"notification_type_doc": ["in", list({n.notification_type_doc for n in notifications})],
+		},
+		fields=value_fields,
+	)
+	seen = {tuple(row[f] for f in value_fields) for row in existing}
+
+	now = now_datetime()
+	user = frappe.session.user
+	values = []
+	recipients = set()
+	for n in notifications:
+		key = tuple(n[f] for f in value_fields)
+		if key in seen:
+			continue
+		seen.add(key)
+		values.append((frappe.generate_hash(length=10), now, now, user, user, 0, *key))
+		recipients.add(n.to_user)
+
+	if not values:
+		return
+
+	frappe.db.bulk_insert(
+		"CRM Notification",
+		["name", "creation", "modified", "owner", "modified_by", "docstatus", *value_fields],
+		values,
+	)
+	for to_user in recipients:
+		frappe.publish_realtime("crm_notification", user=to_user, after_commit=True)
+
+
+def get_notification_values(args):
+	return frappe._dict(
 		doctype="CRM Notification",
 		from_user=args.owner,
 		to_user=args.assigned_to,
@@ -31,7 +89,3 @@ def notify_user(args):
 		reference_doctype=args.redirect_to_doctype,
 		reference_name=args.redirect_to_docname,
 	)
-
-	if frappe.db.exists("CRM Notification", values):
-		return
-	frappe.get_doc(values).insert(ignore_permissions=True)
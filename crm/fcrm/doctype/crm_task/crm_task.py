@@ -179,3 +179,10 @@ class CRMTask(Document):
 				pass
 		
 		return data
+
+
+def on_doctype_update():
+	# overdue sweep in crm.api.doc.mark_overdue_tasks filters on status + due_date
+	frappe.db.add_index("CRM Task", ["status", "due_date"])
+	# activity counts and task lists of a lead/deal filter on the reference pair
+	frappe.db.add_index("CRM Task", ["reference_doctype", "reference_docname"])
@@ -10,6 +10,8 @@ from frappe.frappeclient import FrappeClient
 from frappe.model.document import Document
 from frappe.utils import get_url_to_form, get_url_to_list
 
+from crm.fcrm.doctype.crm_form_script.crm_form_script import clear_form_script_cache
+
 
 class ERPNextCRMSettings(Document):
 	def validate(self):
@@ -76,6 +78,7 @@ class ERPNextCRMSettings(Document):
 			if frappe.db.exists("CRM Form Script", "Create Quotation from CRM Deal"):
 				script = get_crm_form_script()
 				frappe.db.set_value("CRM Form Script", "Create Quotation from CRM Deal", "script", script)
+				clear_form_script_cache()
 				return True
 			return False
 		except Exception:
@@ -1,7 +1,7 @@
 # Copyright (c) 2023, Frappe Technologies Pvt. Ltd. and contributors
 # For license information, please see license.txt
 
-# import frappe
+import frappe
 from frappe.model.document import Document
 
 
@@ -18,3 +18,8 @@ class FCRMNote(Document):
 			"modified",
 		]
 		return {'columns': [], 'rows': rows}
+
+
+def on_doctype_update():
+	# activity counts and note lists of a lead/deal filter on the reference pair
+	frappe.db.add_index("FCRM Note", ["reference_doctype", "reference_docname"])
@@ -177,6 +177,23 @@ doc_events = {
         "on_update": ["crm.api.reminders.recalc_from_reminder"],
         "on_trash": ["crm.api.reminders.recalc_from_reminder"],
     },
+    # تعديل أعمدة Reminder يبطل كاش السكيمة، وتعديل حقول أي DocType يبطل كاش حقول mobile_api
+    "DocType": {
+        "on_update": [
+            "crm.api.reminders.clear_reminder_schema_cache",
+            "crm.api.mobile_api.clear_doctype_fieldnames_cache",
+        ],
+    },
+    "Custom Field": {
+        "on_update": [
+            "crm.api.reminders.clear_reminder_schema_cache",
+            "crm.api.mobile_api.clear_doctype_fieldnames_cache",
+        ],
+        "on_trash": [
+            "crm.api.reminders.clear_reminder_schema_cache",
+            "crm.api.mobile_api.clear_doctype_fieldnames_cache",
+        ],
+    },
     # التحقق من due_date وتحديث الحالة إلى Backlog تلقائياً
     "CRM Task": {
         "on_load": ["crm.api.task_status.check_and_update_task_status"],
@@ -0,0 +1,9 @@
+import frappe
+
+
+def execute():
+	# Assignee lookups filter open ToDos by (reference_type, reference_name, status);
+	# add_index is a no-op when the index already exists
+	frappe.db.add_index(
+		"ToDo", ["reference_type", "reference_name", "status"], index_name="idx_todo_ref_status"
+	)
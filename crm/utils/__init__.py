@@ -1,4 +1,5 @@
 import functools
+import json
 
 import frappe
 import phonenumbers
@@ -10,6 +11,11 @@ from frappe.utils import floor
 from phonenumbers import NumberParseException
 from phonenumbers import PhoneNumberFormat as PNF
 
+try:
+	import orjson
+except ImportError:
+	orjson = None
+
 
 def parse_phone_number(phone_number, default_country="IN"):
 	try:
@@ -230,6 +236,133 @@ def get_dynamic_linked_docs(doc, method="Delete"):
 	return docs
 
 
+def get_bulk_linked_docs(doctype, names, method="Delete"):
+	"""
+	get_linked_docs for many documents of `doctype` at once: one IN (...) query per link
+	field across all `names` instead of one query per link field per document.
+	"""
+	from frappe.model.rename_doc import get_link_fields
+
+	names = list(dict.fromkeys(names))
+	if not names:
+		return []
+
+	name_set = set(names)
+	ignored_doctypes = set()
+	if method == "Delete":
+		ignored_doctypes.update(frappe.get_hooks("ignore_links_on_delete"))
+
+	docs = []
+
+	for lf in get_link_fields(doctype):
+		link_dt, link_field, issingle = lf["parent"], lf["fieldname"], lf["issingle"]
+		if link_dt in ignored_doctypes or (link_field == "amended_from" and method == "Cancel"):
+			continue
+
+		try:
+			meta = frappe.get_meta(link_dt)
+		except frappe.DoesNotExistError:
+			frappe.clear_last_message()
+			continue
+
+		if issingle:
+			value = frappe.db.get_single_value(link_dt, link_field)
+			if value in name_set:
+				docs.append({"doc": value, "link_dt": link_dt, "link_field": link_field})
+			continue
+
+		fields = ["name", "docstatus", f"{link_field} as linked_name"]
+
+		if meta.istable:
+			fields.extend(["parent", "parenttype"])
+
+		for item in frappe.db.get_values(link_dt, {link_field: ["in", names]}, fields, as_dict=True):
+			item_parent = getattr(item, "parent", None)
+			linked_parent_doctype = item.parenttype if item_parent else link_dt
+
+			if linked_parent_doctype in ignored_doctypes:
+				continue
+
+			if method != "Delete" and (method != "Cancel" or not DocStatus(item.docstatus).is_submitted()):
+				continue
+			elif link_dt == doctype and (item_parent or item.name) == item.linked_name:
+				continue
+			else:
+				docs.append(
+					{
+						"doc": item.linked_name,
+						"reference_doctype": linked_parent_doctype,
+						"reference_docname": item_parent or item.name,
+					}
+				)
+	return docs
+
+
+def get_bulk_dynamic_linked_docs(doctype, names, method="Delete"):
+	"""
+	get_dynamic_linked_docs for many documents of `doctype` at once: one IN (...) query per
+	dynamic link field across all `names` instead of one query per field per document.
+	"""
+	names = list(dict.fromkeys(names))
+	if not names:
+		return []
+
+	name_set = set(names)
+	ignored_doctypes = frappe.get_hooks("ignore_links_on_delete")
+	docs = []
+	for df in get_dynamic_link_map().get(doctype, []):
+		if df.parent in ignored_doctypes:
+			# don't check for communication and todo!
+			continue
+
+		meta = frappe.get_meta(df.parent)
+		if meta.issingle:
+			# dynamic link in single doc
+			refdoc = frappe.db.get_singles_dict(df.parent)
+			if (
+				refdoc.get(df.options) == doctype
+				and refdoc.get(df.fieldname) in name_set
+				and (
+					(method == "Delete" and not DocStatus(refdoc.docstatus).is_cancelled())
+					or (method == "Cancel" and DocStatus(refdoc.docstatus).is_submitted())
+				)
+			):
+				docs.append(
+					{
+						"doc": refdoc.get(df.fieldname),
+						"reference_doctype": df.parent,
+						"reference_docname": df.parent,
+					}
+				)
+		else:
+			# dynamic link in table
+			table = ", `parent`, `parenttype`, `idx`" if meta.istable else ""
+			for refdoc in frappe.db.sql(
+				f"""select `name`, `docstatus`, `{df.fieldname}` as linked_name {table}
+				from `tab{df.parent}` where `{df.options}`=%s and `{df.fieldname}` in %s""",
+				(doctype, tuple(names)),
+				as_dict=True,
+			):
+				if (method == "Delete" and not DocStatus(refdoc.docstatus).is_cancelled()) or (
+					method == "Cancel" and DocStatus(refdoc.docstatus).is_submitted()
+				):
+					reference_doctype = refdoc.parenttype if meta.istable else df.parent
+					reference_docname = refdoc.parent if meta.istable else refdoc.name
+
+					if reference_doctype in ignored_doctypes:
+						continue
+
+					docs.append(
+						{
+							"doc": refdoc.linked_name,
+							"reference_doctype": reference_doctype,
+							"reference_docname": reference_docname,
+							"at_position": f"at Row: {refdoc.idx}" if meta.istable else "",
+						}
+					)
+	return docs
+
+
 def is_admin(user: str | None = None) -> bool:
 	"""
 	Check whether `user` is an admin
@@ -296,3 +429,18 @@ def get_exchange_rate(from_currency, to_currency, date=None):
 			date = "latest"
 		...
 
+
+def json_loads(value):
+	"""Parse a JSON str/bytes (orjson when available). Already-decoded values are returned as-is."""
+	if not isinstance(value, str | bytes):
+		return value
+	if orjson:
+		return orjson.loads(value)
+	return json.loads(value)
+
+
+def json_dumps(value) -> str:
+	"""Serialize to a compact JSON string (orjson when available)."""
+	if orjson:
+		return orjson.dumps(value).decode()
+	return json.dumps(value, separators=(",", ":"))